@@ -0,0 +1,71 @@
+"""Compare the grouped fiscal-year OHLCV aggregation with the original per-year loop.
+
+Generates synthetic daily bars for many tickers, rolls them up into April-March
+fiscal-year bars with the loop fetch_ohlc_data used to run (slice, aggregate,
+pd.concat one row at a time) and with aggregate_ohlc, and checks both give the
+same bars. Quarterly and monthly bars are timed too.
+
+Usage:
+    python benchmarks/bench_ohlc.py [--tickers 500] [--start-year 2013] [--end-year 2024]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from ohlc import aggregate_ohlc
+from prices import synthetic_prices
+
+def legacy_fiscal_year_ohlc(panel, start_year, end_year):
+    """The original loop, run over an already downloaded panel."""
+    all_data = pd.DataFrame()
+    for symbol, daily in panel.groupby('symbol'):
+        daily = daily.set_index('Date')
+        for year in range(start_year, end_year + 1):
+            data = daily[(daily.index >= datetime(year - 1, 4, 1)) & (daily.index <= datetime(year, 3, 31))]
+            if not data.empty:
+                yearly_data = {
+                    'Open': data['Open'].iloc[0],
+                    'High': data['High'].max(),
+                    'Low': data['Low'].min(),
+                    'Close': data['Close'].iloc[-1],
+                    'Volume': data['Volume'].sum(),
+                }
+                yearly_data_df = pd.DataFrame([yearly_data])
+                yearly_data_df['symbol'] = symbol
+                yearly_data_df['Date'] = f"Mar {year}"
+                all_data = pd.concat([all_data, yearly_data_df])
+    return all_data.reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--start-year', type=int, default=2013)
+    parser.add_argument('--end-year', type=int, default=2024)
+    args = parser.parse_args()
+
+    symbols = [f"T{i:05d}.NS" for i in range(args.tickers)]
+    panel = synthetic_prices(symbols, datetime(args.start_year - 1, 4, 1), datetime(args.end_year, 4, 1))
+    print(f"{args.tickers} tickers, {len(panel)} daily rows")
+
+    start = time.perf_counter()
+    legacy = legacy_fiscal_year_ohlc(panel, args.start_year, args.end_year)
+    legacy_seconds = time.perf_counter() - start
+    print(f"{'loop':12s} {legacy_seconds:7.2f} s")
+
+    for freq in ['fiscal_year', 'quarterly', 'monthly']:
+        start = time.perf_counter()
+        bars = aggregate_ohlc(panel, freq)
+        seconds = time.perf_counter() - start
+        print(f"{freq:12s} {seconds:7.2f} s  {legacy_seconds / seconds:6.1f}x  {len(bars)} bars")
+        if freq == 'fiscal_year':
+            columns = ['symbol', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+            identical = legacy[columns].astype(str).equals(bars[columns].astype(str))
+    print(f"identical={identical}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare the parse_table HTML parser backends on saved company pages.
+
+Usage:
+    python benchmarks/bench_parsers.py [saved_page.html ...] [--repeat N]
+
+Save pages with e.g. `curl -b cookies.txt https://www.screener.in/company/ITC/consolidated/ > itc.html`.
+Without arguments a synthetic screener-like page is used.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_parsers import PARSER_BACKENDS, lxml
+from screener import parse_sections
+from fake_screener import synthetic_page
+
+def time_backend(pages, backend, repeat):
+    """Return seconds per page and the parsed frames for one backend."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        frames = [parse_sections(page, backend=backend) for page in pages]
+    return (time.perf_counter() - start) / (repeat * len(pages)), frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*', help='saved company page HTML files')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.pages:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    if not pages:
+        pages = [synthetic_page()]
+
+    backends = [name for name in PARSER_BACKENDS if name != 'lxml' or lxml is not None]
+    results = {name: time_backend(pages, name, args.repeat) for name in backends}
+
+    baseline_time, baseline_frames = results['bs4']
+    for name, (seconds, frames) in results.items():
+        identical = all(
+            a.keys() == b.keys() and all(a[k].equals(b[k]) for k in a)
+            for a, b in zip(baseline_frames, frames)
+        )
+        print(f"{name:6s} {seconds * 1000:8.2f} ms/page  {baseline_time / seconds:5.1f}x  identical={identical}")
+
+if __name__ == "__main__":
+    main()
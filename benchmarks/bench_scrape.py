@@ -0,0 +1,102 @@
+"""End-to-end scrape benchmark against the local fake screener.in.
+
+Runs the same stages as the scraper entry points - login, concurrent fetch
+through the rate-limited transport, parse, transform and load - for many
+synthetic tickers, and reports pages/sec, parse time and DB load time.
+
+Usage:
+    python benchmarks/bench_scrape.py --companies 2000 --concurrency 16 --latency 0.1
+    python benchmarks/bench_scrape.py --entry-point comp-bs.py --db-url postgresql+psycopg2://...
+
+The default --db-url is an in-memory SQLite database.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_screener import start_server
+
+def load_entry_point(filename):
+    """Import one of the hyphenated entry point scripts as a module."""
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_').replace('.py', ''), os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entry-point', default='comp-all.py', choices=['comp-all.py', 'comp-bs.py', 'comp-pl.py'])
+    parser.add_argument('--companies', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=1000.0, help='transport rate limit, requests/sec')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--pages-dir')
+    parser.add_argument('--db-url', default='sqlite://')
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, pages_dir=args.pages_dir,
+    )
+    # Must be set before the scraper modules read their URLs
+    os.environ['SCREENER_BASE_URL'] = base_url
+    os.environ.pop('SCREENER_SESSION_FILE', None)
+
+    from sqlalchemy import create_engine
+    from screener import COMPANY_URL, concat_statements, fetch_all_data, parse_sections, save_to_transposed_csv
+    from session_store import login_session
+    from snapshot import write_statement_snapshot
+    from statements import load_to_postgres
+    from transport import Transport
+
+    sections = load_entry_point(args.entry_point).SECTIONS
+
+    companies = [f'TICK{i:05d}' for i in range(args.companies)]
+    session = login_session('bench', 'bench')
+    transport = Transport(session, concurrency=args.concurrency, rate=args.rate)
+
+    start = time.perf_counter()
+    pages = fetch_all_data(transport, [COMPANY_URL.format(company=c) for c in companies], max_workers=args.concurrency)
+    fetch_seconds = time.perf_counter() - start
+    failed = sum(page is None for page in pages)
+
+    start = time.perf_counter()
+    all_data = {section_id: [] for section_id in sections}
+    for company, page in zip(companies, pages):
+        if page:
+            for section_id, df in parse_sections(page, sections).items():
+                save_to_transposed_csv(df, company, all_data[section_id], section_id)
+    parse_seconds = time.perf_counter() - start
+
+    engine = create_engine(args.db_url)
+    start = time.perf_counter()
+    rows = 0
+    for section_id, table_name in sections.items():
+        if all_data[section_id]:
+            merged_df = concat_statements(all_data[section_id])
+            rows += len(merged_df)
+            write_statement_snapshot(merged_df, table_name)
+            if not load_to_postgres(merged_df, engine, table_name):
+                server.shutdown()
+                raise SystemExit(f"Loading {table_name} failed.")
+    load_seconds = time.perf_counter() - start
+    server.shutdown()
+
+    fetched = len(pages) - failed
+    print()
+    print(f"entry point     {args.entry_point}")
+    print(f"companies       {len(companies)} ({failed} failed, {server.state.requests} HTTP requests)")
+    print(f"fetch           {fetch_seconds:8.2f} s  {fetched / fetch_seconds:8.1f} pages/s")
+    print(f"parse+transform {parse_seconds:8.2f} s  {parse_seconds / max(fetched, 1) * 1000:8.2f} ms/page")
+    print(f"db load         {load_seconds:8.2f} s  {rows / max(load_seconds, 1e-9):8.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
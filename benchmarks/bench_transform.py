@@ -0,0 +1,94 @@
+"""Compare the vectorized save_to_transposed_csv with the per-column original.
+
+Builds parse_table-style frames for many companies (thousands separators,
+percentages and blank cells included), runs both transforms and checks the
+results hold the same values. Also reports the memory of each merged frame,
+since the vectorized transform produces the compact typed schema.
+
+Usage:
+    python benchmarks/bench_transform.py [--companies 2000] [--rows 15] [--years 12]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from screener import concat_statements, save_to_transposed_csv, widen_statement_frame
+
+def legacy_save_to_transposed_csv(df, company_name, all_data_list):
+    """The original implementation: regex replace and to_numeric column by column."""
+    if df is not None:
+        df_transposed = df.set_index('Narration').T
+        df_transposed.reset_index(inplace=True)
+        df_transposed.rename(columns={'index': 'Date'}, inplace=True)
+
+        for col in df_transposed.columns:
+            if col != 'Date':
+                df_transposed[col] = df_transposed[col].replace({',': '', '%': ''}, regex=True)
+                df_transposed[col] = pd.to_numeric(df_transposed[col], errors='coerce')
+
+        df_transposed = df_transposed.fillna(0)
+        df_transposed.columns = [col.lower().replace(' ', '_').replace('+', '').replace('%', 'percent') for col in df_transposed.columns]
+        df_transposed.rename(columns=lambda x: x.strip(), inplace=True)
+        df_transposed['company_name'] = company_name
+        all_data_list.append(df_transposed)
+
+def company_frame(rng, n_rows, n_years):
+    """A raw statement table as parse_table returns it."""
+    headers = ['Narration'] + [f"Mar {2013 + i}" for i in range(n_years)]
+    rows = []
+    for r in range(n_rows):
+        kind = r % 3
+        if kind == 0:
+            cells = [f"{rng.randint(-5000, 500000):,}" for _ in range(n_years)]
+        elif kind == 1:
+            cells = [f"{rng.randint(0, 60)}%" for _ in range(n_years)]
+        else:
+            cells = [f"{rng.uniform(-100, 1000):.2f}" if rng.random() > 0.1 else '' for _ in range(n_years)]
+        rows.append([f"Line item {r} +"] + cells)
+    return pd.DataFrame(rows, columns=headers)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=15)
+    parser.add_argument('--years', type=int, default=12)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    frames = [company_frame(rng, args.rows, args.years) for _ in range(args.companies)]
+
+    timings = {}
+    outputs = {}
+    runs = [
+        ('per-column', legacy_save_to_transposed_csv, lambda out: pd.concat(out, ignore_index=True)),
+        ('vectorized', save_to_transposed_csv, concat_statements),
+    ]
+    for name, transform, concat in runs:
+        out = []
+        start = time.perf_counter()
+        for i, df in enumerate(frames):
+            transform(df, f"C{i}", out)
+        merged = concat(out)
+        timings[name] = time.perf_counter() - start
+        outputs[name] = merged
+
+    # The compact frame widened back to float64 and plain strings, without the
+    # typed period columns, must match the original with its line items as floats
+    widened = widen_statement_frame(outputs['vectorized']).drop(columns=['period_end', 'period_type'])
+    widened = widened.astype({'date': str, 'company_name': str})
+    original = outputs['per-column']
+    original = original.astype({col: np.float64 for col in original.columns[original.dtypes == np.int64]})
+    identical = original.equals(widened)
+    for name, seconds in timings.items():
+        memory = outputs[name].memory_usage(deep=True).sum() / 2**20
+        print(f"{name:10s} {seconds:7.2f} s  {timings['per-column'] / seconds:5.1f}x  {memory:8.1f} MiB")
+    print(f"{args.companies} companies, {len(outputs['vectorized'])} rows, identical={identical}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Local stand-in for screener.in for load tests.
+
+Mimics the login flow (CSRF token, session cookie, redirect to /dash/ and
+back to /login/ without a session) and serves /company/<X>/consolidated/ for
+any ticker: recorded pages from --pages-dir (<TICKER>.html) when present,
+otherwise a deterministic synthetic page. Latency and error rates are
+configurable.
+
+Usage:
+    python benchmarks/fake_screener.py --port 8000 --latency 0.2 --error-rate 0.05
+    SCREENER_BASE_URL=http://127.0.0.1:8000 python comp-all.py
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+STATEMENT_SECTIONS = ['profit-loss', 'balance-sheet', 'cash-flow', 'quarters', 'ratios']
+COMPANY_PATH = re.compile(r'^/company/([^/]+)/consolidated/$')
+
+def synthetic_page(ticker='SYNTH', n_rows=15, n_years=12, filler_kb=200):
+    """Build a screener-like company page with every statement section."""
+    rng = random.Random(ticker)
+    years = [f"Mar {2013 + i}" for i in range(n_years)]
+    header = "<tr><th></th>" + "".join(f"<th>{y}</th>" for y in years) + "</tr>"
+    sections = []
+    for section_id in STATEMENT_SECTIONS:
+        body = "".join(
+            f"<tr><td class='text'>Line item {r} +</td>"
+            + "".join(f"<td>{rng.randint(-5000, 500000):,}</td>" for _ in range(n_years))
+            + "</tr>"
+            for r in range(n_rows)
+        )
+        sections.append(f"<section id='{section_id}'><h2>{section_id}</h2><table>{header}{body}</table></section>")
+    filler = "<div class='nav'><a href='#'>link</a><span>text</span></div>" * (filler_kb * 1024 // 60)
+    return f"<html><head><title>{ticker}</title></head><body>{filler}{''.join(sections)}</body></html>".encode()
+
+class FakeScreener:
+    """Server state and configuration shared by all request handlers."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, pages_dir=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.pages_dir = pages_dir
+        self.csrf_tokens = set()
+        self.sessions = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def page(self, ticker):
+        """Body of one company page, built on every request so no pages stay in memory."""
+        if self.pages_dir:
+            path = os.path.join(self.pages_dir, f'{ticker}.html')
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+        return synthetic_page(ticker)
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _cookies(self):
+            cookies = {}
+            for part in self.headers.get('Cookie', '').split(';'):
+                if '=' in part:
+                    name, value = part.strip().split('=', 1)
+                    cookies[name] = value
+            return cookies
+
+        def _send(self, status, body=b'', headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _logged_in(self):
+            return self._cookies().get('sessionid') in state.sessions
+
+        def do_GET(self):
+            with state.lock:
+                state.requests += 1
+            path = self.path.split('?')[0]
+
+            if path == '/login/':
+                token = secrets.token_hex(16)
+                state.csrf_tokens.add(token)
+                form = f'<form method="post"><input name="csrfmiddlewaretoken" value="{token}"></form>'
+                return self._send(200, form.encode(), {'Set-Cookie': f'csrftoken={token}; Path=/'})
+            if path == '/dash/':
+                if not self._logged_in():
+                    return self._send(302, headers={'Location': '/login/?next=/dash/'})
+                return self._send(200, b'<html>dash</html>')
+
+            match = COMPANY_PATH.match(path)
+            if not match:
+                return self._send(404, b'not found')
+            if not self._logged_in():
+                return self._send(302, headers={'Location': f'/login/?next={path}'})
+
+            time.sleep(max(0.0, state.latency + random.uniform(-state.jitter, state.jitter)))
+            roll = random.random()
+            if roll < state.throttle_rate:
+                return self._send(429, b'slow down', {'Retry-After': '1'})
+            if roll < state.throttle_rate + state.error_rate:
+                return self._send(503, b'unavailable')
+
+            body = state.page(match.group(1))
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, headers={'ETag': etag})
+            self._send(200, body, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            form = parse_qs(self.rfile.read(length).decode())
+            token = form.get('csrfmiddlewaretoken', [''])[0]
+            if token not in state.csrf_tokens or not form.get('username'):
+                return self._send(200, b'<html>login failed</html>')
+            session_id = secrets.token_hex(16)
+            state.sessions.add(session_id)
+            self._send(302, headers={
+                'Set-Cookie': f'sessionid={session_id}; Path=/; Max-Age=86400',
+                'Location': '/dash/',
+            })
+
+    return Handler
+
+def start_server(port=0, **options):
+    """Start the fake server in a background thread; return (server, base_url)."""
+    state = FakeScreener(**options)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every company page')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- seconds of random latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of pages answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of pages answered with 429')
+    parser.add_argument('--pages-dir', help='directory of recorded <TICKER>.html pages')
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, pages_dir=args.pages_dir,
+    )
+    print(f"Fake screener listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from screener import LOGIN_URL, DASH_URL, COMPANY_URL
+
+# Read a whole section table in one WebDriver round trip: [headers, rows]
+TABLE_SCRIPT = """
+const table = document.querySelector('section#' + arguments[0] + ' table');
+if (!table) { return null; }
+const text = cell => cell.innerText.trim();
+const headers = Array.from(table.querySelectorAll('th'), text);
+const rows = Array.from(table.querySelectorAll('tr')).slice(1).map(
+    row => Array.from(row.querySelectorAll('td'), text));
+return [headers, rows];
+"""
+
+def create_driver():
+    """Start a headless Chrome WebDriver."""
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    return webdriver.Chrome(options=options)
+
+def login_driver(driver, username, password, timeout=15):
+    """Log the driver in, waiting for the redirect to the dashboard. Return True on success."""
+    driver.get(LOGIN_URL)
+    wait = WebDriverWait(driver, timeout)
+    username_input = wait.until(EC.presence_of_element_located((By.ID, 'id_username')))
+    password_input = driver.find_element(By.ID, 'id_password')
+
+    username_input.send_keys(username)
+    password_input.send_keys(password)
+    password_input.send_keys(Keys.RETURN)
+
+    try:
+        wait.until(EC.url_to_be(DASH_URL))
+        return True
+    except TimeoutException:
+        print("Login failed.")
+        return False
+
+def fetch_table(driver, company, section_id='profit-loss', timeout=15):
+    """Open a company page and return the section table as a DataFrame, or None."""
+    driver.get(COMPANY_URL.format(company=company))
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f'section#{section_id} table'))
+        )
+    except TimeoutException:
+        print(f"Timed out waiting for the {section_id} table of {company}.")
+        return None
+
+    cells = driver.execute_script(TABLE_SCRIPT, section_id)
+    if not cells:
+        print(f"Failed to find the {section_id} table of {company}.")
+        return None
+    headers, rows = cells
+
+    data = []
+    for cols in rows:
+        if len(cols) == len(headers):
+            data.append(cols)
+        else:
+            print(f"Row data length mismatch: {cols}")
+
+    df = pd.DataFrame(data, columns=headers)
+    if not df.empty:
+        df.columns = ['Narration'] + df.columns[1:].tolist()
+    return df
+
+class BrowserPool:
+    """A fixed number of logged-in headless browsers shared across many companies.
+
+    Use as a context manager; drivers are quit on exit.
+    """
+
+    def __init__(self, username, password, size=2):
+        self.username = username
+        self.password = password
+        self.size = size
+        self._drivers = queue.Queue()
+        self._all = []
+
+    def __enter__(self):
+        for _ in range(self.size):
+            driver = create_driver()
+            self._all.append(driver)
+            if not login_driver(driver, self.username, self.password):
+                self.close()
+                raise RuntimeError("Could not log in the browser pool.")
+            self._drivers.put(driver)
+        print(f"Browser pool of {self.size} logged in.")
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for driver in self._all:
+            driver.quit()
+        self._all = []
+
+    def _fetch(self, company, section_id):
+        driver = self._drivers.get()
+        try:
+            return fetch_table(driver, company, section_id)
+        finally:
+            self._drivers.put(driver)
+
+    def fetch_tables(self, companies, section_id='profit-loss'):
+        """Fetch one section table per company; results are in company order."""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda company: self._fetch(company, section_id), companies))
@@ -0,0 +1,74 @@
+import pandas as pd
+from sqlalchemy import inspect, text
+from db import lock_table
+from pg_copy import bulk_load
+from schema_drift import add_missing_columns
+
+KEY_COLUMNS = ['company_name', 'date']
+
+def row_hashes(df, key_columns=KEY_COLUMNS):
+    """Return df's key columns plus a row_hash of all other columns."""
+    value_columns = sorted(c for c in df.columns if c not in key_columns)
+    hashes = pd.util.hash_pandas_object(df[value_columns], index=False)
+    state = df[key_columns].copy()
+    state['row_hash'] = [format(h, '016x') for h in hashes]
+    return state.reset_index(drop=True)
+
+def diff_rows(new_state, old_state, key_columns=KEY_COLUMNS):
+    """Compare two row_hashes() frames and return (inserted, updated, deleted) key frames."""
+    merged = new_state.merge(old_state, on=key_columns, how='outer', suffixes=('', '_old'), indicator=True)
+    inserted = merged.loc[merged['_merge'] == 'left_only', key_columns]
+    deleted = merged.loc[merged['_merge'] == 'right_only', key_columns]
+    both = merged[merged['_merge'] == 'both']
+    updated = both.loc[both['row_hash'] != both['row_hash_old'], key_columns]
+    return inserted, updated, deleted
+
+def _delete_keys(conn, table_name, keys, key_columns):
+    if keys.empty:
+        return
+    where = ' AND '.join(f'"{c}" = :{c}' for c in key_columns)
+    conn.execute(text(f'DELETE FROM "{table_name}" WHERE {where}'), keys.to_dict('records'))
+
+def load_changes(df, engine, table_name, key_columns=KEY_COLUMNS):
+    """Write only the rows of df that differ from the last load of table_name.
+
+    Row hashes from the previous load live in <table_name>_row_hashes. Updated
+    rows are deleted and re-inserted, and rows missing from df are deleted -
+    only for companies (the first key column) present in df, so a company
+    whose page failed to fetch, or that belongs to another shard, keeps its
+    rows. Everything happens in one transaction. Columns the table lacks are
+    added in place; only the first load falls back to a full replace.
+    """
+    state_table = f'{table_name}_row_hashes'
+    new_state = row_hashes(df, key_columns)
+
+    with engine.begin() as conn:
+        lock_table(conn, table_name)
+
+        inspector = inspect(conn)
+        full_load = not (inspector.has_table(table_name) and inspector.has_table(state_table))
+        if not full_load:
+            add_missing_columns(conn, df, table_name)
+
+        if full_load:
+            print(f"Full load of {table_name}: no usable previous state.")
+            bulk_load(df, conn, table_name, if_exists='replace')
+            bulk_load(new_state, conn, state_table, if_exists='replace')
+            return len(df), 0, 0
+
+        old_state = pd.read_sql_table(state_table, con=conn)
+        scope = key_columns[0]
+        old_state = old_state[old_state[scope].isin(new_state[scope])]
+        inserted, updated, deleted = diff_rows(new_state, old_state, key_columns)
+
+        changed = pd.concat([updated, deleted])
+        _delete_keys(conn, table_name, changed, key_columns)
+        _delete_keys(conn, state_table, changed, key_columns)
+
+        written = pd.concat([inserted, updated])
+        if not written.empty:
+            bulk_load(df.merge(written, on=key_columns)[df.columns], conn, table_name, if_exists='append')
+            bulk_load(new_state.merge(written, on=key_columns), conn, state_table, if_exists='append')
+
+    print(f"{table_name}: {len(inserted)} inserted, {len(updated)} updated, {len(deleted)} deleted.")
+    return len(inserted), len(updated), len(deleted)
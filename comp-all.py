@@ -0,0 +1,12 @@
+from screener import STATEMENT_SECTIONS
+from statements import scrape_statements
+
+# Every consolidated statement section, each into its own ten_comp_* table
+SECTIONS = STATEMENT_SECTIONS
+
+def main():
+    """Log in once, fetch each company page once and load every statement section."""
+    scrape_statements(SECTIONS, 'comp-all', "Scrape every consolidated statement section into the ten_comp_* tables.")
+
+if __name__ == "__main__":
+    main()
@@ -168,103 +168,123 @@
 #     main()
 
 
-import yfinance as yf
+import os
 import pandas as pd
-from sqlalchemy import create_engine
 from datetime import datetime
+from sqlalchemy import bindparam, text
+from db import get_engine
+from change_detection import load_changes
+from pg_copy import bulk_load
+from pg_merge import merge_load
+from price_store import get_price_table, recompute_bars, update_price_store
+from ohlc import aggregate_ohlc
+from periods import index_periods
+from prices import get_price_source
+from snapshot import OHLC_SCHEMA, write_snapshot
+from universe import parse_universe_args, companies_for
 
 # Function to fetch OHLC and Volume data for fiscal year (April 1 to March 31)
-def fetch_ohlc_data(companies, start_year=2013, end_year=2024):
-    all_data = pd.DataFrame()
-
+def fetch_ohlc_data(companies, start_year=2013, end_year=2024, source=None, freq='fiscal_year'):
+    # One batched download of the whole range for every company
+    source_name, fetch_prices = get_price_source(source)
+    print(f"Fetching daily prices for {len(companies)} companies from {source_name}.")
+    # Fiscal year `year` runs from April 1 of the previous year to March 31 of `year`
+    prices = fetch_prices(list(companies.values()), datetime(start_year - 1, 4, 1), datetime(end_year, 4, 1))
+
+    fetched = set(prices['symbol'])
     for name, symbol in companies.items():
-        stock = yf.Ticker(symbol)
-
-        for year in range(start_year, end_year + 1):
-            # Fiscal year starts from April 1 of the previous year to March 31 of the current year
-            start_date = datetime(year - 1, 4, 1)
-            end_date = datetime(year, 3, 31)
-
-            try:
-                # Fetch data for the fiscal year period, including Volume
-                data = stock.history(start=start_date, end=end_date)[['Open', 'High', 'Low', 'Close', 'Volume']]
-
-                if not data.empty:
-                    # Aggregate OHLC data using first, max, min, and last for the period
-                    yearly_data = {
-                        'Open': data['Open'].iloc[0],   # First Open of the period
-                        'High': data['High'].max(),     # Maximum High of the period
-                        'Low': data['Low'].min(),       # Minimum Low of the period
-                        'Close': data['Close'].iloc[-1], # Last Close of the period
-                        'Volume': data['Volume'].sum()  # Total Volume over the fiscal year
-                    }
-
-                    # Convert it into a DataFrame
-                    yearly_data_df = pd.DataFrame([yearly_data], index=[f"FY {year-1}-{year}"])
-                    
-                    # Add columns for Company and Date (Fiscal Year ending in March)
-                    yearly_data_df['Company'] = name
-                    yearly_data_df['Date'] = f"Mar {year}"
-
-                    all_data = pd.concat([all_data, yearly_data_df])
+        if symbol not in fetched:
+            print(f"No data for {name} ({symbol}) from {source_name}.")
 
-                else:
-                    print(f"No data for {name} ({symbol}) for the period {start_date} to {end_date}.")
+    # All companies' fiscal-year bars in one grouped pass, labelled "Mar 2024" like the statements
+    return company_bars(aggregate_ohlc(prices, freq), companies)
 
-            except Exception as e:
-                print(f"Error fetching data for {name} ({symbol}) for the period {start_date} to {end_date}: {e}")
-
-    # Reset index so Fiscal_Year becomes a column
-    all_data.reset_index(drop=True, inplace=True)
-
-    # Reorder columns for better readability
-    cols = ['Date', 'Company'] + [col for col in all_data.columns if col not in ['Date', 'Company']]
-    all_data = all_data[cols]
+def company_bars(bars, companies):
+    """Lay aggregate_ohlc bars out as fiscal_year_ohlc rows, with company names for symbols."""
+    bars = bars.assign(Company=bars['symbol'].map({symbol: name for name, symbol in companies.items()}))
+    all_data = bars[['Date', 'period_end', 'period_type', 'Company', 'Open', 'High', 'Low', 'Close', 'Volume']].copy()
 
+    # Typed fiscal period as a DATE for the load
+    all_data['period_end'] = all_data['period_end'].dt.date
     return all_data
 
+def fetch_new_ohlc_data(companies, engine, price_table, start_year=2013, end_year=2024, source=None, freq='fiscal_year'):
+    """Bring the daily price store up to date and return the fiscal-year rows the new days changed.
+
+    The store keeps every day up to today, but like fetch_ohlc_data only bars
+    of fiscal years up to end_year are returned, so the year still in
+    progress is never loaded as an annual row.
+    """
+    first_new = update_price_store(list(companies.values()), engine, price_table,
+                                   datetime(start_year - 1, 4, 1), source=source)
+    bars = recompute_bars(engine, price_table, first_new, freq)
+    return company_bars(bars[bars['period_end'] < datetime(end_year, 4, 1)], companies)
+
+def read_ohlc_rows(engine, table_name, companies):
+    """Read back every stored row of the given companies."""
+    query = text(f'SELECT * FROM "{table_name}" WHERE "Company" IN :companies ORDER BY "Company", period_end')
+    with engine.connect() as conn:
+        return pd.read_sql_query(query.bindparams(bindparam('companies', expanding=True)), conn,
+                                 params={'companies': list(companies)})
+
 # Function to save data to CSV
 def save_to_csv(data, filename):
     data.to_csv(filename, index=False)
     print(f"Data saved to {filename}")
 
-def load_to_postgresql(data, db_details, table_name):
-    connection_string = f"postgresql://{db_details['user']}:{db_details['password']}@{db_details['host']}:{db_details['port']}/{db_details['dbname']}"
-    engine = create_engine(connection_string)
-    data.to_sql(table_name, engine, if_exists='replace', index=False)
+def load_to_postgresql(data, engine, table_name, mode='replace'):
+    if mode == 'delta':
+        # Only this run's companies are touched, so shards can share the table
+        load_changes(data, engine, table_name, key_columns=['Company', 'Date'])
+    elif mode == 'merge':
+        merge_load(data, engine, table_name, ['Company', 'Date'], scope_column='Company')
+    elif mode == 'upsert':
+        # Recomputed fiscal years only; the company's other rows stay
+        merge_load(data, engine, table_name, ['Company', 'Date'], delete_missing=False)
+    else:
+        bulk_load(data, engine, table_name, if_exists='replace')
+    with engine.begin() as conn:
+        index_periods(conn, table_name, company_column='Company')
     print(f"Data loaded into PostgreSQL table '{table_name}'.")
 # Main function to orchestrate the process
 def main():
-    companies = {
-        "HINDUNILVR": "HINDUNILVR.NS",
-        "ITC": "ITC.NS",
-        "JYOTHYLAB": "JYOTHYLAB.NS",
-        "BRITANNIA": "BRITANNIA.NS",
-        "TATACONSUM": "TATACONSUM.NS",
-        "DABUR": "DABUR.NS",
-        "GODREJCP": "GODREJCP.NS",
-        "MARICO": "MARICO.NS",
-        "ZYDUSWELL": "ZYDUSWELL.NS",
-        "EMAMILTD": "EMAMILTD.NS"
-    }
+    args = parse_universe_args("Load fiscal-year OHLC and volume from yfinance into fiscal_year_ohlc.")
+
+    # Shared pooled PostgreSQL engine (PG_* environment variables)
+    engine = get_engine()
+    if not engine:
+        return
+
+    # This shard's companies from the shared universe, as name -> yfinance symbol
+    universe = companies_for(args, get_engine)
+    companies = dict(zip(universe['symbol'], universe['yf_symbol']))
+
+    price_table = get_price_table()
+    if price_table:
+        # Fetch only the days the price store lacks and rewrite only the fiscal years they fall in
+        all_data = fetch_new_ohlc_data(companies, engine, price_table, start_year=2013, end_year=2024)
+        if all_data.empty:
+            return
+        load_to_postgresql(all_data, engine, 'fiscal_year_ohlc', 'upsert')
+
+        # The CSV and snapshot partitions hold complete companies, so read their rows back
+        all_data = read_ohlc_rows(engine, 'fiscal_year_ohlc', all_data['Company'].unique())
+        save_to_csv(all_data, 'fiscal_year_ohlc_data.csv')
+        write_snapshot(all_data, 'fiscal_year_ohlc', OHLC_SCHEMA, partition_by='Company')
+        return
 
     # Fetch OHLC and Volume data for fiscal years from April 1 to March 31
     all_data = fetch_ohlc_data(companies, start_year=2013, end_year=2024)
 
     # Save to CSV
     save_to_csv(all_data, 'fiscal_year_ohlc_data.csv')
+    write_snapshot(all_data, 'fiscal_year_ohlc', OHLC_SCHEMA, partition_by='Company')
 
-    # PostgreSQL database details
-    db_details = {
-        'host': '192.168.56.1',
-        'port': '5432',
-        'dbname': 'concourse',
-        'user': 'concourse_user',
-        'password': 'concourse_pass'
-    }
-
-    # Load data into PostgreSQL
-    load_to_postgresql(all_data, db_details, 'fiscal_year_ohlc')
+    # Load data into PostgreSQL; shards share the table, so each only replaces its own rows
+    load_mode = os.getenv('LOAD_MODE', 'replace')
+    if args.shard_count > 1 and load_mode not in ('delta', 'merge'):
+        load_mode = 'delta'
+    load_to_postgresql(all_data, engine, 'fiscal_year_ohlc', load_mode)
 
 # Run the process
 if __name__ == "__main__":
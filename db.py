@@ -0,0 +1,58 @@
+import os
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL
+
+_engine = None
+
+def database_url():
+    """Connection URL from DATABASE_URL, or from the PG_* variables."""
+    if os.getenv('DATABASE_URL'):
+        return os.getenv('DATABASE_URL')
+    return URL.create(
+        'postgresql+psycopg2',
+        username=os.getenv('PG_USER', 'concourse_user'),
+        password=os.getenv('PG_PASSWORD', 'concourse_pass'),
+        host=os.getenv('PG_HOST', '192.168.56.1'),
+        port=int(os.getenv('PG_PORT', '5432')),
+        database=os.getenv('PG_DATABASE', 'concourse'),
+    )
+
+def engine_options():
+    """Pool settings from PG_POOL_SIZE, PG_MAX_OVERFLOW, PG_POOL_RECYCLE and PG_STATEMENT_TIMEOUT (ms, 0 = none)."""
+    options = {
+        'pool_size': int(os.getenv('PG_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('PG_MAX_OVERFLOW', '5')),
+        'pool_recycle': int(os.getenv('PG_POOL_RECYCLE', '1800')),
+        # Test connections on checkout so a restarted server doesn't fail the next load
+        'pool_pre_ping': True,
+    }
+    timeout = int(os.getenv('PG_STATEMENT_TIMEOUT', '0'))
+    if timeout:
+        options['connect_args'] = {'options': f'-c statement_timeout={timeout}'}
+    return options
+
+def lock_table(conn, table_name):
+    """Serialize writers of table_name across processes until conn's transaction ends.
+
+    Shards load the same tables at once; DDL such as CREATE TABLE or
+    CREATE INDEX IF NOT EXISTS can still race without it. Postgres only.
+    """
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text('SELECT pg_advisory_xact_lock(hashtext(:name))'), {'name': table_name})
+
+def get_engine():
+    """Return the process-wide pooled PostgreSQL engine, creating it on first use.
+
+    Every loader in the process shares this engine, so batches and concurrent
+    writers reuse pooled connections instead of reconnecting. Returns None if
+    the engine cannot be created.
+    """
+    global _engine
+    if _engine is None:
+        try:
+            _engine = create_engine(database_url(), **engine_options())
+            print("PostgreSQL engine created successfully.")
+        except Exception as e:
+            print(f"Error creating PostgreSQL engine: {e}")
+            return None
+    return _engine
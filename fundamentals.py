@@ -0,0 +1,125 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from db import get_engine, lock_table
+from pg_merge import merge_load
+from periods import period_columns
+from screener import STATEMENT_SECTIONS, clean_column_name, to_numeric_block
+
+# Long-format store: one row per (company, statement, line_item, period)
+KEY_COLUMNS = ['company', 'statement', 'line_item', 'period']
+
+def get_fundamentals_table(default=None):
+    """Name of the long fundamentals table from FUNDAMENTALS_TABLE; unset disables it."""
+    return os.getenv('FUNDAMENTALS_TABLE', default) or None
+
+def to_long(df, company_name, statement):
+    """Turn one parse_table frame into long rows (company, statement, line_item, period, value).
+
+    Line items get the same names as the ten_comp_* columns, and each row
+    also carries the typed period_end and period_type. Blank or non-numeric
+    cells are left out instead of being stored as 0.
+    """
+    if df is None:
+        return None
+    numbers, _ = to_numeric_block(df.iloc[:, 1:].to_numpy())
+    items = [clean_column_name(item) for item in df['Narration']]
+    periods = list(df.columns[1:])
+    period_end, period_type = period_columns(tuple(periods), statement)
+    long_df = pd.DataFrame({
+        'company': company_name,
+        'statement': statement,
+        'line_item': np.repeat(items, len(periods)),
+        'period': np.tile(periods, len(items)),
+        'period_end': np.tile(period_end.date, len(items)),
+        'period_type': np.tile(np.asarray(period_type, dtype=object), len(items)),
+        'value': numbers.ravel(),
+    })
+    # A repeated line item keeps its first row, as the key must be unique
+    long_df = long_df[long_df['value'].notna()].drop_duplicates(['line_item', 'period'])
+    return long_df.reset_index(drop=True)
+
+def load_fundamentals(long_df, engine, table_name=None):
+    """Merge long rows into the fundamentals table and return (upserted, deleted).
+
+    Only the (company, statement) pairs present in long_df are replaced, so
+    each run or shard can load whatever statements it scraped. The table is
+    keyed on (company, statement, line_item, period), with a second index on
+    (statement, line_item, period_end) for one metric across all companies.
+    """
+    table_name = table_name or get_fundamentals_table('fundamentals')
+    if long_df is None or long_df.empty:
+        return 0, 0
+    counts = merge_load(long_df, engine, table_name, KEY_COLUMNS, scope_column=['company', 'statement'])
+    with engine.begin() as conn:
+        lock_table(conn, table_name)
+        conn.execute(text(
+            f'CREATE INDEX IF NOT EXISTS "{table_name}_metric" ON "{table_name}" (statement, line_item, period_end)'
+        ))
+    return counts
+
+def load_long_frames(frames, engine, table_name=None):
+    """Concatenate to_long frames and merge them into the fundamentals table; True on success."""
+    frames = [df for df in frames if df is not None]
+    if not frames:
+        return True
+    try:
+        load_fundamentals(pd.concat(frames, ignore_index=True), engine, table_name)
+        return True
+    except Exception as e:
+        print(f"Error loading fundamentals into PostgreSQL: {e}")
+        return False
+
+# Quoting for names that end up in DDL; ':' is escaped because text() reads :name as a bind parameter
+def _identifier(name):
+    return '"' + name.replace('"', '""').replace(':', r'\:') + '"'
+
+def _literal(value):
+    return "'" + value.replace("'", "''").replace(':', r'\:') + "'"
+
+def create_wide_view(engine, statement, view_name=None, table_name=None):
+    """(Re)create a wide view of one statement shaped like its ten_comp_* table.
+
+    The view has date, period_end, period_type, one column per line item
+    seen for the statement and company_name, with 0 where a company has no
+    value, like the wide loads. It is rebuilt from the current line items
+    each time, so call it after loads that may add new ones. Returns the
+    view name.
+    """
+    table_name = table_name or get_fundamentals_table('fundamentals')
+    view_name = view_name or f"{STATEMENT_SECTIONS[statement]}_wide"
+    with engine.begin() as conn:
+        items = conn.execute(
+            text(f'SELECT DISTINCT line_item FROM {_identifier(table_name)} WHERE statement = :statement ORDER BY line_item'),
+            {'statement': statement},
+        ).scalars().all()
+        pivots = ''.join(
+            f',\n    COALESCE(MAX(CASE WHEN line_item = {_literal(item)} THEN value END), 0) AS {_identifier(item)}'
+            for item in items
+        )
+        conn.execute(text(f'DROP VIEW IF EXISTS {_identifier(view_name)}'))
+        conn.execute(text(
+            f'CREATE VIEW {_identifier(view_name)} AS\n'
+            f'SELECT period AS date, period_end, period_type{pivots},\n    company AS company_name\n'
+            f'FROM {_identifier(table_name)}\nWHERE statement = {_literal(statement)}\n'
+            f'GROUP BY company, period, period_end, period_type'
+        ))
+    print(f"View {view_name} created with {len(items)} line items.")
+    return view_name
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the wide <table>_wide views over the long fundamentals table.")
+    parser.add_argument('--table', default=get_fundamentals_table('fundamentals'))
+    parser.add_argument('statements', nargs='*', default=list(STATEMENT_SECTIONS), help='statement sections (default: all)')
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if not engine:
+        return
+    for statement in args.statements:
+        create_wide_view(engine, statement, table_name=args.table)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 #spark-submit tjob.py
 from awsglue.context import GlueContext
 from pyspark.context import SparkContext
-from pyspark.sql.functions import col, avg, row_number, coalesce, when, lit, round, lag
+from pyspark.sql.functions import col, avg, row_number, coalesce, when, lit, round, lag, expr
 from pyspark.sql.window import Window
-from pyspark.sql.types import StructType, StructField, StringType, LongType, DoubleType
+from pyspark.sql.types import StructType, StructField, StringType, LongType, DoubleType, IntegerType
 import time
 import psycopg2
 import json
@@ -24,6 +24,7 @@ postgres_url = "192.168.56.1"
 postgres_db = "concourse"
 postgres_user = "concourse_user"
 postgres_password = "concourse_pass"
+source_table = "ten_comp_pl"  # table behind kafka_topic
 postgres_table = "sink_tcpl_transformed"
 
 # Kafka consumer setup
@@ -39,6 +40,8 @@ schema = StructType([
     StructField("payload", StructType([
         StructField("before", StructType([
             StructField("date", StringType(), True),
+            StructField("period_end", IntegerType(), True),  # DATE arrives as days since 1970-01-01
+            StructField("period_type", StringType(), True),
             StructField("sales", DoubleType(), True),
             StructField("expenses", DoubleType(), True),
             StructField("operating_profit", DoubleType(), True),
@@ -55,6 +58,8 @@ schema = StructType([
         ])),
         StructField("after", StructType([
             StructField("date", StringType(), True),
+            StructField("period_end", IntegerType(), True),  # DATE arrives as days since 1970-01-01
+            StructField("period_type", StringType(), True),
             StructField("sales", DoubleType(), True),
             StructField("expenses", DoubleType(), True),
             StructField("operating_profit", DoubleType(), True),
@@ -84,6 +89,28 @@ def get_postgres_connection():
         host=postgres_url
     )
 
+# Warn about source columns the schema above does not know; they are dropped until added to it
+def report_schema_drift():
+    conn = get_postgres_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT to_regclass('schema_versions')")
+        if cur.fetchone()[0] is None:
+            return
+        cur.execute(
+            "SELECT version, columns FROM schema_versions WHERE table_name = %s ORDER BY version DESC LIMIT 1",
+            (source_table,)
+        )
+        row = cur.fetchone()
+        if row:
+            known = set(schema["payload"].dataType["after"].dataType.fieldNames())
+            unknown = [c for c in json.loads(row[1]) if c not in known]
+            if unknown:
+                print(f"{source_table} schema version {row[0]} has columns not in the message schema: {', '.join(unknown)}")
+    finally:
+        cur.close()
+        conn.close()
+
 # Create table if it does not exist
 def create_table_if_not_exists():
     conn = get_postgres_connection()
@@ -92,6 +119,8 @@ def create_table_if_not_exists():
     create_table_query = f"""
     CREATE TABLE IF NOT EXISTS {postgres_table} (
         date VARCHAR,
+        period_end DATE,
+        period_type VARCHAR,
         company_name VARCHAR,
         sales DOUBLE PRECISION,
         expenses DOUBLE PRECISION,
@@ -116,12 +145,16 @@ def create_table_if_not_exists():
     );
     """
     cur.execute(create_table_query)
+    # Tables created before the typed period columns existed
+    cur.execute(f"ALTER TABLE {postgres_table} ADD COLUMN IF NOT EXISTS period_end DATE, ADD COLUMN IF NOT EXISTS period_type VARCHAR")
+    cur.execute(f"CREATE INDEX IF NOT EXISTS {postgres_table}_period ON {postgres_table} (company_name, period_end)")
     conn.commit()
     cur.close()
     conn.close()
 
 # Call the function to ensure table exists
 create_table_if_not_exists()
+report_schema_drift()
 
 while True:
     try:
@@ -135,6 +168,8 @@ while True:
             .selectExpr(f"from_json(value, '{schema.simpleString()}') as data") \
             .select(
                 col("data.payload.after.date").alias("date"),
+                expr("date_add(DATE'1970-01-01', data.payload.after.period_end)").alias("period_end"),
+                col("data.payload.after.period_type"),
                 col("data.payload.after.sales"),
                 col("data.payload.after.expenses"),
                 col("data.payload.after.operating_profit"),
@@ -186,6 +221,8 @@ while True:
             .join(df_deduped.alias("incoming"), on=["date", "company_name"], how="outer") \
             .select(
                 coalesce(col("incoming.date"), col("existing.date")).alias("date"),
+                coalesce(col("incoming.period_end"), col("existing.period_end")).alias("period_end"),
+                coalesce(col("incoming.period_type"), col("existing.period_type")).alias("period_type"),
                 coalesce(col("incoming.sales"), col("existing.sales")).alias("sales"),
                 coalesce(col("incoming.expenses"), col("existing.expenses")).alias("expenses"),
                 coalesce(col("incoming.operating_profit"), col("existing.operating_profit")).alias("operating_profit"),
@@ -216,22 +253,22 @@ while True:
             .withColumn(
     "yoy_sales_growth",
     round(
-        ((col("sales") - lag(col("sales"), 1).over(Window.partitionBy("company_name").orderBy("date"))) 
-        / lag(col("sales"), 1).over(Window.partitionBy("company_name").orderBy("date"))
+        ((col("sales") - lag(col("sales"), 1).over(Window.partitionBy("company_name", "period_type").orderBy("period_end"))) 
+        / lag(col("sales"), 1).over(Window.partitionBy("company_name", "period_type").orderBy("period_end"))
         ) * 100, 2
     ).cast(DoubleType())
 )  \
             .withColumn(
     "yoy_net_profit_growth",
     round(
-        ((col("net_profit") - lag(col("net_profit"), 1).over(Window.partitionBy("company_name").orderBy("date"))) 
-        / lag(col("net_profit"), 1).over(Window.partitionBy("company_name").orderBy("date"))
+        ((col("net_profit") - lag(col("net_profit"), 1).over(Window.partitionBy("company_name", "period_type").orderBy("period_end"))) 
+        / lag(col("net_profit"), 1).over(Window.partitionBy("company_name", "period_type").orderBy("period_end"))
         ) * 100, 2
     ).cast(DoubleType())
 )
 
         # Sort the DataFrame
-        combined_df = combined_df.orderBy(col("company_name").asc(), col("date").asc())
+        combined_df = combined_df.orderBy(col("company_name").asc(), col("period_end").asc())
         combined_df = combined_df.filter(~col("date").startswith("TTM"))
 
         # Save to local CSV
@@ -248,14 +285,16 @@ while True:
         for _, row in combined_df_pandas.iterrows():
             query = """
                 INSERT INTO {} (
-                    date, company_name, sales, expenses, operating_profit, opm_percent, other_income,
+                    date, period_end, period_type, company_name, sales, expenses, operating_profit, opm_percent, other_income,
                     interest, depreciation, profit_before_tax, tax_percent, net_profit,
                     eps_in_rs, dividend_payout_percent, net_profit_margin, operating_profit_margin, tax_amount, dividend_yield,
                     interest_coverage_ratio, yoy_sales_growth, yoy_net_profit_growth
                 ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
                 )
                 ON CONFLICT (date, company_name) DO UPDATE SET
+                    period_end = EXCLUDED.period_end,
+                    period_type = EXCLUDED.period_type,
                     sales = EXCLUDED.sales,
                     expenses = EXCLUDED.expenses,
                     operating_profit = EXCLUDED.operating_profit,
@@ -277,7 +316,7 @@ while True:
                     yoy_net_profit_growth = EXCLUDED.yoy_net_profit_growth
             """.format(postgres_table)
             cur.execute(query, (
-                row["date"], row["company_name"], row["sales"], row["expenses"], row["operating_profit"],
+                row["date"], row["period_end"], row["period_type"], row["company_name"], row["sales"], row["expenses"], row["operating_profit"],
                 row["opm_percent"], row["other_income"], row["interest"], row["depreciation"],
                 row["profit_before_tax"], row["tax_percent"], row["net_profit"], row["eps_in_rs"],
                 row["dividend_payout_percent"], row["net_profit_margin"], row["operating_profit_margin"], row["tax_amount"], row["dividend_yield"],
@@ -0,0 +1,63 @@
+import os
+import re
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional, the bs4 backend always works
+    lxml = None
+
+# Each backend takes a page and a section id and returns (headers, rows) for the
+# first table in that section, or None when the section or table is missing.
+# rows holds the <td> texts of every <tr> after the header row.
+
+def bs4_table_cells(page, section_id):
+    """Extract table cells with BeautifulSoup; page may be raw HTML or an existing soup."""
+    soup = page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, 'html.parser')
+    section = soup.find('section', {'id': section_id})
+    table = section.find('table') if section is not None else None
+    if table is None:
+        return None
+    headers = [th.text.strip() or f'Column_{i}' for i, th in enumerate(table.find_all('th'))]
+    rows = [[col.text.strip() for col in row.find_all('td')] for row in table.find_all('tr')[1:]]
+    return headers, rows
+
+def _section_html(page, section_id):
+    """Slice the raw HTML of one <section> out of the page without parsing the rest."""
+    if isinstance(page, str):
+        page = page.encode('utf-8')
+    start = re.search(rb'<section\b[^>]*\bid=["\']' + re.escape(section_id.encode()) + rb'["\'][^>]*>', page)
+    if start is None:
+        return None
+    end = page.find(b'</section>', start.end())
+    end = len(page) if end == -1 else end + len(b'</section>')
+    return page[start.start():end]
+
+def lxml_table_cells(page, section_id):
+    """Extract table cells with lxml, parsing only the target section."""
+    html = _section_html(page, section_id)
+    if html is None:
+        return None
+    section = lxml.html.fromstring(html.decode('utf-8', errors='replace'))
+    tables = section.xpath('.//table')
+    if not tables:
+        return None
+    table = tables[0]
+    headers = [th.text_content().strip() or f'Column_{i}' for i, th in enumerate(table.iter('th'))]
+    rows = [[col.text_content().strip() for col in row.iter('td')] for row in list(table.iter('tr'))[1:]]
+    return headers, rows
+
+PARSER_BACKENDS = {
+    'bs4': bs4_table_cells,
+    'lxml': lxml_table_cells,
+}
+
+def get_backend(name=None):
+    """Return the table extractor for name (default PARSER_BACKEND env var, then bs4)."""
+    name = name or os.getenv('PARSER_BACKEND', 'bs4')
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}'. Choose from {sorted(PARSER_BACKENDS)}.")
+    if name == 'lxml' and lxml is None:
+        print("lxml is not installed, falling back to the bs4 parser backend.")
+        name = 'bs4'
+    return name, PARSER_BACKENDS[name]
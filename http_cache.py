@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import threading
+
+def sha256_digest(content):
+    """Default content hash: SHA-256 of the whole response body."""
+    return hashlib.sha256(content).hexdigest()
+
+class ResponseCache:
+    """On-disk cache of GET responses keyed by URL.
+
+    Each entry keeps the body, its ETag/Last-Modified validators and a content
+    hash. Fetches go through conditional_headers() and store(); URLs whose
+    content differs from the cached copy are collected in `changed`. New
+    entries are only written to disk by commit(), so call it after the data
+    has been loaded successfully - a failed run is then retried in full.
+    """
+
+    def __init__(self, cache_dir, digest=sha256_digest):
+        self.cache_dir = cache_dir
+        self.digest = digest
+        self.changed = set()
+        self._pending = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.html'
+
+    def lookup(self, url):
+        """Return the cached metadata for url, or None if there is no usable entry."""
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def body(self, url):
+        """Return the cached body for url."""
+        _, body_path = self._paths(url)
+        with open(body_path, 'rb') as f:
+            return f.read()
+
+    def conditional_headers(self, url):
+        """Return If-None-Match/If-Modified-Since headers for url."""
+        meta = self.lookup(url)
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """Record a 200 or 304 response and return the page body.
+
+        A 304, or a 200 whose content hash matches the cached one, counts as
+        unchanged; anything else marks url as changed.
+        """
+        if response.status_code == 304:
+            return self.body(url)
+
+        content = response.content
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'digest': self.digest(content),
+        }
+        cached = self.lookup(url)
+        with self._lock:
+            if cached is None or cached.get('digest') != meta['digest']:
+                self.changed.add(url)
+            self._pending[url] = (meta, content)
+        return content
+
+    def commit(self, urls=None):
+        """Write the entries fetched in this run to disk, or only those for urls."""
+        with self._lock:
+            urls = list(self._pending) if urls is None else [u for u in urls if u in self._pending]
+            for url in urls:
+                meta, content = self._pending.pop(url)
+                meta_path, body_path = self._paths(url)
+                with open(body_path, 'wb') as f:
+                    f.write(content)
+                with open(meta_path, 'w') as f:
+                    json.dump(meta, f)
+            if urls:
+                print(f"HTTP cache updated with {len(urls)} entries.")
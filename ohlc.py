@@ -0,0 +1,44 @@
+import pandas as pd
+from periods import ANNUAL, MONTHLY, QUARTERLY
+
+# Bar frequencies: months per bar and the period_type the bars carry. Bars end
+# in March, June, September or December, so quarters and fiscal years line up
+# with the April-March fiscal year.
+BAR_FREQUENCIES = {
+    'fiscal_year': (12, ANNUAL),
+    'quarterly': (3, QUARTERLY),
+    'monthly': (1, MONTHLY),
+}
+
+# How each daily column rolls up into a bar
+BAR_AGGREGATIONS = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def bar_period_end(dates, freq='fiscal_year'):
+    """Last day of the bar each date falls in, e.g. 2024-03-31 for any day from Apr 2023 to Mar 2024."""
+    months, _ = BAR_FREQUENCIES[freq]
+    # A panel repeats the same few thousand trading days for every symbol
+    codes, dates = pd.factorize(pd.DatetimeIndex(dates))
+    month_index = dates.year * 12 + dates.month - 1
+    # Round up to the next month index that ends a bar; March is month index 2 (mod 12)
+    end_index = month_index + (2 - month_index) % months
+    first_day = pd.to_datetime({'year': end_index // 12, 'month': end_index % 12 + 1, 'day': 1})
+    return (pd.DatetimeIndex(first_day) + pd.offsets.MonthEnd(0)).take(codes)
+
+def aggregate_ohlc(panel, freq='fiscal_year'):
+    """Roll a daily price panel (symbol, Date, Open, High, Low, Close, Volume) up into bars.
+
+    Every symbol and bar is aggregated in one grouped pass: first Open, max
+    High, min Low, last Close and summed Volume. Returns one row per
+    (symbol, bar) with the "Mar 2024" style Date label, period_end and
+    period_type, sorted by symbol and period_end.
+    """
+    _, period_type = BAR_FREQUENCIES[freq]
+    panel = panel.sort_values(['symbol', 'Date'], kind='stable')
+    period_end = bar_period_end(panel['Date'], freq)
+    bars = panel.groupby([panel['symbol'].to_numpy(), period_end], sort=True)[list(BAR_AGGREGATIONS)].agg(BAR_AGGREGATIONS)
+    bars.index.names = ['symbol', 'period_end']
+    bars = bars.reset_index()
+    bars['Volume'] = bars['Volume'].fillna(0).astype('int64')
+    bars.insert(1, 'Date', bars['period_end'].dt.strftime('%b %Y'))
+    bars.insert(3, 'period_type', period_type)
+    return bars
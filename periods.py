@@ -0,0 +1,64 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from db import lock_table
+
+# Period types carried next to every period label
+ANNUAL = 'annual'
+INTERIM = 'interim'
+QUARTERLY = 'quarterly'
+MONTHLY = 'monthly'
+TTM = 'ttm'
+
+# Statement sections whose columns are quarters rather than fiscal years
+QUARTERLY_SECTIONS = ('quarters',)
+
+def parse_periods(labels, statement=None):
+    """Turn screener period labels ("Mar 2024", "TTM") into (period_end, period_type).
+
+    period_end is the last day of the labelled month. A TTM column has no
+    month of its own, so it gets the latest period_end among the labels it
+    came with. In annual statements a month other than the usual fiscal
+    year end (e.g. a "Sep 2024" half-year balance sheet) is typed interim.
+    Labels that are neither get NaT and None.
+    """
+    labels = pd.Index([str(label).strip() for label in labels])
+    period_end = pd.to_datetime(labels, format='%b %Y', errors='coerce') + pd.offsets.MonthEnd(0)
+    is_ttm = labels.str.upper().str.startswith('TTM')
+
+    dated = period_end[~period_end.isna()]
+    period_type = np.full(len(labels), None, dtype=object)
+    if statement in QUARTERLY_SECTIONS:
+        period_type[~period_end.isna()] = QUARTERLY
+    elif len(dated):
+        year_end = dated.month.value_counts().idxmax()
+        period_type[~period_end.isna()] = np.where(period_end.month[~period_end.isna()] == year_end, ANNUAL, INTERIM)
+    if is_ttm.any():
+        period_end = period_end.where(~is_ttm, dated.max() if len(dated) else pd.NaT)
+        period_type[is_ttm] = TTM
+    return period_end, period_type
+
+@lru_cache(maxsize=1024)
+def period_columns(labels, statement=None):
+    """Cached parse_periods for a tuple of labels, with period_type as a categorical.
+
+    Companies share the same few label rows, so most calls are cache hits.
+    """
+    period_end, period_type = parse_periods(labels, statement)
+    return period_end, pd.Categorical(period_type)
+
+def add_period_columns(df, statement=None, label_column='date'):
+    """Insert period_end and period_type after df[label_column]; returns df."""
+    period_end, period_type = period_columns(tuple(df[label_column]), statement)
+    position = df.columns.get_loc(label_column) + 1
+    df.insert(position, 'period_end', period_end)
+    df.insert(position + 1, 'period_type', period_type)
+    return df
+
+def index_periods(conn, table_name, company_column='company_name'):
+    """Index table_name on (company, period_end) for range scans and ordered window queries."""
+    lock_table(conn, table_name)
+    conn.execute(text(
+        f'CREATE INDEX IF NOT EXISTS "{table_name}_period" ON "{table_name}" ("{company_column}", period_end)'
+    ))
@@ -0,0 +1,53 @@
+import csv
+import io
+from datetime import date, datetime
+from schema_drift import add_missing_columns
+
+# Written for missing values; COPY treats the unquoted marker as NULL
+NULL_MARKER = r'\N'
+
+def _format_value(value):
+    """Render one cell for COPY: NULL for None/NaN/NaT, ISO text for dates."""
+    if value is None or value != value:  # NaN and NaT are not equal to themselves
+        return NULL_MARKER
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def copy_rows(dbapi_conn, table_name, columns, rows):
+    """Stream rows (tuples in column order) into table_name with one COPY ... FROM STDIN.
+
+    table_name is used as given, so quote it beforehand if needed.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_format_value(v) for v in row])
+    buffer.seek(0)
+
+    column_list = ', '.join(f'"{c}"' for c in columns)
+    sql = f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')"
+    with dbapi_conn.cursor() as cur:
+        cur.copy_expert(sql, buffer)
+        return cur.rowcount
+
+def copy_insert(table, conn, keys, data_iter):
+    """pandas to_sql `method` that streams rows with COPY ... FROM STDIN.
+
+    Rows are written as CSV into an in-memory buffer and sent in one COPY
+    instead of one INSERT per row.
+    """
+    name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    return copy_rows(conn.connection, name, keys, data_iter)
+
+def bulk_load(df, con, table_name, if_exists='replace'):
+    """Drop-in for df.to_sql(table_name, con, if_exists=..., index=False) that uses COPY on Postgres.
+
+    pandas still creates or replaces the table with the usual column types;
+    only the row transfer changes. Other databases use plain to_sql. When
+    appending, columns the table lacks are added first (see schema_drift).
+    """
+    if if_exists == 'append':
+        add_missing_columns(con, df, table_name)
+    method = copy_insert if con.dialect.name == 'postgresql' else None
+    df.to_sql(table_name, con=con, if_exists=if_exists, index=False, method=method)
@@ -0,0 +1,93 @@
+import pandas as pd
+from sqlalchemy import inspect, text
+from db import lock_table
+from pg_copy import copy_rows
+from schema_drift import add_missing_columns
+
+STAGING_TABLE = 'merge_staging'
+
+def _quoted(columns):
+    return ', '.join(f'"{c}"' for c in columns)
+
+def _insert_rows(conn, table_name, columns, rows):
+    """Insert rows (tuples in column order) with one executemany, for databases without COPY."""
+    names = [f'c{i}' for i in range(len(columns))]
+    insert = text(f'INSERT INTO {table_name} ({_quoted(columns)}) VALUES ({", ".join(":" + n for n in names)})')
+    params = [{n: None if pd.isna(v) else v for n, v in zip(names, row)} for row in rows]
+    if params:
+        conn.execute(insert, params)
+
+def merge_load(df, engine, table_name, key_columns, scope_column=None, delete_missing=True):
+    """Upsert df into table_name through a staging table, in one transaction.
+
+    df is COPYed into a temporary staging table (inserted on other databases
+    such as SQLite), then a single INSERT ... ON CONFLICT updates changed rows
+    and adds new ones, and a single DELETE removes target rows missing from
+    df. With scope_column (a column or a list of columns) only rows whose
+    scope value (e.g. company) appears in df are deleted; with
+    delete_missing=False nothing is deleted. Rows whose values did not change
+    are left alone, so CDC only sees real changes.
+    The target is created with a primary key on key_columns if missing, and
+    an existing table without that key gets a unique index on them, and
+    columns it lacks are added in place. Readers never see the table empty.
+    Returns (upserted, deleted) row counts.
+    """
+    columns = list(df.columns)
+    keys = _quoted(key_columns)
+    target = f'"{table_name}"'
+
+    with engine.begin() as conn:
+        # Shards merge into the same table; one at a time, from the has_table check on
+        lock_table(conn, table_name)
+        inspector = inspect(conn)
+        if not inspector.has_table(table_name):
+            conn.execute(text(pd.io.sql.get_schema(df, table_name, keys=key_columns, con=conn)))
+        else:
+            add_missing_columns(conn, df, table_name)
+            if set(inspector.get_pk_constraint(table_name)['constrained_columns']) != set(key_columns):
+                conn.execute(text(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_merge_key" ON {target} ({keys})'))
+
+        # Staging uses df's own column types; INSERT ... SELECT casts them to the target's
+        staging = pd.io.sql.get_schema(df, STAGING_TABLE, con=conn).replace('CREATE TABLE', 'CREATE TEMP TABLE', 1)
+        rows = df.itertuples(index=False, name=None)
+        postgres = conn.dialect.name == 'postgresql'
+        if postgres:
+            conn.execute(text(staging + ' ON COMMIT DROP'))
+            copy_rows(conn.connection, STAGING_TABLE, columns, rows)
+        else:
+            # No COPY or ON COMMIT DROP (SQLite): insert the rows, drop the table at the end
+            conn.execute(text(f'DROP TABLE IF EXISTS {STAGING_TABLE}'))
+            conn.execute(text(staging))
+            _insert_rows(conn, STAGING_TABLE, columns, rows)
+
+        values = [c for c in columns if c not in key_columns]
+        if values:
+            assignments = ', '.join(f'"{c}" = EXCLUDED."{c}"' for c in values)
+            current = ', '.join(f'{target}."{c}"' for c in values)
+            incoming = ', '.join(f'EXCLUDED."{c}"' for c in values)
+            on_conflict = f'DO UPDATE SET {assignments} WHERE ({current}) IS DISTINCT FROM ({incoming})'
+        else:
+            on_conflict = 'DO NOTHING'
+        upserted = conn.execute(text(
+            # WHERE true keeps SQLite from reading ON CONFLICT as part of the SELECT
+            f'INSERT INTO {target} ({_quoted(columns)}) SELECT {_quoted(columns)} FROM {STAGING_TABLE} WHERE true '
+            f'ON CONFLICT ({keys}) {on_conflict}'
+        )).rowcount
+
+        deleted = 0
+        if delete_missing:
+            matches = ' AND '.join(f's."{c}" = t."{c}"' for c in key_columns)
+            scope = ''
+            if scope_column:
+                scope_columns = [scope_column] if isinstance(scope_column, str) else list(scope_column)
+                scoped = ', '.join(f't."{c}"' for c in scope_columns)
+                scope = f'({scoped}) IN (SELECT {_quoted(scope_columns)} FROM {STAGING_TABLE}) AND '
+            deleted = conn.execute(text(
+                f'DELETE FROM {target} AS t WHERE {scope}NOT EXISTS (SELECT 1 FROM {STAGING_TABLE} s WHERE {matches})'
+            )).rowcount
+
+        if not postgres:
+            conn.execute(text(f'DROP TABLE {STAGING_TABLE}'))
+
+    print(f"{table_name}: {upserted} rows inserted or updated, {deleted} deleted.")
+    return upserted, deleted
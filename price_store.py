@@ -0,0 +1,101 @@
+import os
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import bindparam, inspect, text
+from db import lock_table
+from ohlc import BAR_FREQUENCIES, aggregate_ohlc, bar_period_end
+from pg_copy import bulk_load
+from prices import PRICE_COLUMNS, empty_panel, get_price_source, has_weekdays
+
+def get_price_table(default=None):
+    """Name of the daily price store from PRICE_TABLE; unset disables incremental price loads."""
+    return os.getenv('PRICE_TABLE', default) or None
+
+def last_stored_dates(engine, table_name, symbols):
+    """Return {symbol: last stored Date} for the symbols already in the store."""
+    if not symbols or not inspect(engine).has_table(table_name):
+        return {}
+    query = text(f'SELECT symbol, MAX("Date") FROM "{table_name}" WHERE symbol IN :symbols GROUP BY symbol')
+    with engine.connect() as conn:
+        rows = conn.execute(query.bindparams(bindparam('symbols', expanding=True)), {'symbols': list(symbols)})
+        return {symbol: pd.Timestamp(last) for symbol, last in rows}
+
+def store_prices(panel, engine, table_name):
+    """Append new daily rows to the store, which is unique on (symbol, Date)."""
+    if panel.empty:
+        return 0
+    panel = panel[['symbol', 'Date'] + PRICE_COLUMNS].copy()
+    panel['Volume'] = panel['Volume'].fillna(0).astype('int64')
+    with engine.begin() as conn:
+        # Shards append to the same store; the first one creates the table and its index
+        lock_table(conn, table_name)
+        bulk_load(panel, conn, table_name, if_exists='append')
+        conn.execute(text(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_key" ON "{table_name}" (symbol, "Date")'))
+    return len(panel)
+
+def update_price_store(symbols, engine, table_name, start, end=None, source=None):
+    """Fetch only the days after each symbol's last stored date and append them to the store.
+
+    Symbols new to the store are fetched from start. Symbols that share a last
+    stored date are fetched in one batched request. end is exclusive and
+    defaults to today, so a session still trading is never stored. Returns
+    {symbol: first new Date} for the symbols that got new rows.
+    """
+    end = pd.Timestamp(end or datetime.now().date())
+    source_name, fetch_prices = get_price_source(source)
+    last = last_stored_dates(engine, table_name, symbols)
+
+    # Group symbols by the first day they are missing
+    missing_from = {}
+    for symbol in symbols:
+        first = last[symbol] + pd.Timedelta(days=1) if symbol in last else pd.Timestamp(start)
+        # Nothing to fetch when only a weekend has passed since the last stored day
+        if first < end and has_weekdays(first, end):
+            missing_from.setdefault(first, []).append(symbol)
+
+    frames = []
+    for first, batch in sorted(missing_from.items()):
+        print(f"Fetching {len(batch)} symbols from {first.date()} to {end.date()} from {source_name}.")
+        frames.append(fetch_prices(batch, first.to_pydatetime(), end.to_pydatetime()))
+    if not frames:
+        print(f"{table_name} is up to date.")
+        return {}
+
+    panel = pd.concat(frames, ignore_index=True)
+    # Sources may return days around the range; keep only the ones the store lacks
+    stored = pd.to_datetime(panel['symbol'].map(last))
+    panel = panel[stored.isna() | (panel['Date'] > stored)]
+    rows = store_prices(panel, engine, table_name)
+    print(f"{table_name}: {rows} daily rows added for {panel['symbol'].nunique()} symbols.")
+    return panel.groupby('symbol')['Date'].min().to_dict()
+
+def bar_start(dates, freq='fiscal_year'):
+    """First day of the bar each date falls in, e.g. 2023-04-01 for a date in fiscal year 2024."""
+    months, _ = BAR_FREQUENCIES[freq]
+    return bar_period_end(dates, freq) - pd.offsets.MonthBegin(months)
+
+def read_prices(engine, table_name, symbols, since):
+    """Read the stored daily rows of symbols from since onwards as a panel."""
+    query = text(f'SELECT * FROM "{table_name}" WHERE symbol IN :symbols AND "Date" >= :since ORDER BY symbol, "Date"')
+    with engine.connect() as conn:
+        return pd.read_sql_query(
+            query.bindparams(bindparam('symbols', expanding=True)), conn,
+            params={'symbols': list(symbols), 'since': pd.Timestamp(since).to_pydatetime()},
+            parse_dates=['Date'],
+        )
+
+def recompute_bars(engine, table_name, first_new, freq='fiscal_year'):
+    """Aggregate only the bars that new rows fell into, reading their days back from the store.
+
+    first_new is update_price_store's {symbol: first new Date}. Symbols whose
+    first affected bar starts on the same day are read back together, which
+    after a routine daily run is all of them.
+    """
+    if not first_new:
+        return aggregate_ohlc(empty_panel(), freq)
+    symbols = list(first_new)
+    starts = bar_start(pd.DatetimeIndex([first_new[s] for s in symbols]), freq)
+    frames = []
+    for since, group in pd.Series(symbols).groupby(starts, sort=True):
+        frames.append(read_prices(engine, table_name, list(group), since))
+    return aggregate_ohlc(pd.concat(frames, ignore_index=True), freq)
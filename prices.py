@@ -0,0 +1,176 @@
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from transport import backoff_delay
+
+try:
+    import yfinance as yf
+except ImportError:  # only the yfinance source needs it; the file and synthetic sources work offline
+    yf = None
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Each source takes a list of yfinance symbols and a [start, end) date range and
+# returns a daily panel: one row per (symbol, Date) with naive datetime Date and
+# the PRICE_COLUMNS. Symbols without data are simply absent.
+
+def empty_panel():
+    """A panel with no rows, for sources that found nothing."""
+    return pd.DataFrame({'symbol': pd.Series(dtype=object), 'Date': pd.Series(dtype='datetime64[ns]'),
+                         **{c: pd.Series(dtype=float) for c in PRICE_COLUMNS}})
+
+def yfinance_prices(symbols, start, end):
+    """Download daily bars with yf.download, YF_BATCH_SIZE symbols (default 100) per request."""
+    batch_size = int(os.getenv('YF_BATCH_SIZE', '100'))
+    frames = []
+    for i in range(0, len(symbols), batch_size):
+        batch = list(symbols[i:i + batch_size])
+        try:
+            data = yf.download(batch, start=start, end=end, group_by='ticker', auto_adjust=True,
+                               actions=False, progress=False, threads=True)
+        except Exception as e:
+            print(f"Error downloading prices for {', '.join(batch)}: {e}")
+            continue
+        if data is None or data.empty:
+            print(f"No data downloaded for {', '.join(batch)}.")
+            continue
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([batch, data.columns])
+        present = [s for s in batch if s in data.columns.get_level_values(0)]
+        if not present:
+            continue
+        # Columns are (symbol, field); move the symbols into rows
+        panel = pd.concat({s: data[s][PRICE_COLUMNS] for s in present}, names=['symbol', 'Date']).reset_index()
+        # Dates another symbol traded on come back as NaN rows
+        frames.append(panel.dropna(subset=['Close']))
+    if not frames:
+        return empty_panel()
+    panel = pd.concat(frames, ignore_index=True)
+    if panel['Date'].dt.tz is not None:
+        panel['Date'] = panel['Date'].dt.tz_localize(None)
+    return panel
+
+def file_prices(symbols, start, end, path=None):
+    """Read daily bars from PRICE_FILE, a CSV or Parquet file laid out like the panel."""
+    path = path or os.getenv('PRICE_FILE', 'prices.csv')
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, parse_dates=['Date'])
+    mask = df['symbol'].isin(symbols) & (df['Date'] >= pd.Timestamp(start)) & (df['Date'] < pd.Timestamp(end))
+    return df.loc[mask, ['symbol', 'Date'] + PRICE_COLUMNS].reset_index(drop=True)
+
+# Synthetic series all start here, so any date range sees the same bars for a day
+SYNTHETIC_ORIGIN = '2000-01-03'
+
+def synthetic_prices(symbols, start, end):
+    """Deterministic random-walk bars on weekdays, seeded by symbol, for offline runs and benchmarks."""
+    dates = pd.bdate_range(SYNTHETIC_ORIGIN, pd.Timestamp(end) - pd.Timedelta(days=1))
+    keep = dates >= pd.Timestamp(start)
+    frames = []
+    for symbol in symbols:
+        # One generator per field, so a longer range only appends draws
+        seed = zlib.crc32(symbol.encode('utf-8'))
+        rngs = [np.random.default_rng([seed, field]) for field in range(4)]
+        close = 100 * np.exp(np.cumsum(rngs[0].normal(0, 0.015, len(dates))))
+        open_ = close * np.exp(rngs[1].normal(0, 0.005, len(dates)))
+        spread = np.abs(rngs[2].normal(0, 0.01, len(dates)))
+        volume = rngs[3].integers(10_000, 5_000_000, len(dates))
+        frames.append(pd.DataFrame({
+            'symbol': symbol,
+            'Date': dates[keep],
+            'Open': open_[keep].round(2),
+            'High': (np.maximum(open_, close) * (1 + spread))[keep].round(2),
+            'Low': (np.minimum(open_, close) * (1 - spread))[keep].round(2),
+            'Close': close[keep].round(2),
+            'Volume': volume[keep],
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else empty_panel()
+
+PRICE_SOURCES = {
+    'yfinance': yfinance_prices,
+    'file': file_prices,
+    'synthetic': synthetic_prices,
+}
+
+def has_weekdays(start, end):
+    """Whether [start, end) holds a weekday; a range of only weekends has no bars anywhere."""
+    return np.busday_count(pd.Timestamp(start).date(), pd.Timestamp(end).date()) > 0
+
+def fetch_symbol(fetch, symbol, start, end, retries=3):
+    """Fetch one symbol with a source, retrying errors with backoff.
+
+    yf.download reports failed symbols (throttling included) as empty data,
+    so an empty panel is retried too, unless the range has no weekdays. A
+    symbol still empty after the retries has no bars in the range (e.g. a
+    holiday) and is not a failure. Returns (panel, None) on success, or
+    (None, last error) once retries run out.
+    """
+    error = None
+    panel = empty_panel()
+    for attempt in range(retries + 1 if has_weekdays(start, end) else 0):
+        if attempt:
+            delay = backoff_delay(attempt - 1)
+            print(f"Fetching {symbol} failed ({error or 'no data'}), retrying in {delay:.1f}s.")
+            time.sleep(delay)
+        try:
+            panel = fetch([symbol], start, end)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            continue
+        error = None
+        if not panel.empty:
+            break
+    if error is not None:
+        return None, error
+    return panel, None
+
+def threaded_prices(fetch, max_workers=4, retries=3):
+    """Wrap a source so every symbol is fetched on its own in a pool of max_workers threads.
+
+    Each symbol is retried on its own, and the symbols that still failed are
+    listed in a failure report at the end and left out of the panel. Symbols
+    without bars in the range are counted separately; they did not fail.
+    """
+    def fetch_each(symbols, start, end):
+        frames = []
+        failures = {}
+        empty = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(symbol, executor.submit(fetch_symbol, fetch, symbol, start, end, retries)) for symbol in symbols]
+            for symbol, future in futures:
+                panel, error = future.result()
+                if error is not None:
+                    failures[symbol] = error
+                elif panel.empty:
+                    empty += 1
+                else:
+                    frames.append(panel)
+        if empty:
+            print(f"{empty} of {len(symbols)} symbols have no bars from {start} to {end}.")
+        if failures:
+            print(f"{len(failures)} of {len(symbols)} symbols failed after {retries} retries:")
+            for symbol, error in failures.items():
+                print(f"  {symbol}: {error}")
+        return pd.concat(frames, ignore_index=True) if frames else empty_panel()
+    return fetch_each
+
+def get_price_source(name=None, workers=None):
+    """Return (name, fetch function) for name (default PRICE_SOURCE env var, then yfinance).
+
+    With workers (default PRICE_WORKERS, 0 = off) symbols are fetched one by
+    one in that many threads, each retried PRICE_RETRIES times (default 3).
+    """
+    name = name or os.getenv('PRICE_SOURCE', 'yfinance')
+    if name not in PRICE_SOURCES:
+        raise ValueError(f"Unknown price source '{name}'. Choose from {sorted(PRICE_SOURCES)}.")
+    if name == 'yfinance' and yf is None:
+        raise ImportError("yfinance is not installed; set PRICE_SOURCE=file or synthetic to run offline.")
+    workers = workers if workers is not None else int(os.getenv('PRICE_WORKERS', '0'))
+    if workers > 0:
+        retries = int(os.getenv('PRICE_RETRIES', '3'))
+        return f"{name} ({workers} workers)", threaded_prices(PRICE_SOURCES[name], workers, retries)
+    return name, PRICE_SOURCES[name]
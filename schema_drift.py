@@ -0,0 +1,114 @@
+import json
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import BigInteger, Boolean, Date, DateTime, Float, Integer, Text
+
+# One row per schema change of a loaded table, for consumers that need to adapt
+SCHEMA_VERSIONS_TABLE = 'schema_versions'
+
+def column_type(series):
+    """SQLAlchemy type for a new column, matching what pandas to_sql would create."""
+    if pd.api.types.is_bool_dtype(series):
+        return Boolean()
+    if pd.api.types.is_integer_dtype(series):
+        return BigInteger()
+    if pd.api.types.is_float_dtype(series):
+        return Float(precision=53)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return DateTime()
+    if pd.api.types.infer_dtype(series, skipna=True) == 'date':
+        return Date()
+    return Text()
+
+def _ensure_versions_table(conn):
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS {SCHEMA_VERSIONS_TABLE} ('
+        'table_name TEXT NOT NULL, version INTEGER NOT NULL, columns TEXT NOT NULL, added TEXT NOT NULL, '
+        'recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (table_name, version))'
+    ))
+
+def schema_version(conn, table_name):
+    """Return (version, columns) last recorded for table_name, or (0, None)."""
+    _ensure_versions_table(conn)
+    row = conn.execute(
+        text(f'SELECT version, columns FROM {SCHEMA_VERSIONS_TABLE} WHERE table_name = :table_name '
+             'ORDER BY version DESC LIMIT 1'),
+        {'table_name': table_name},
+    ).first()
+    return (row[0], json.loads(row[1])) if row else (0, None)
+
+def _record_version(conn, table_name, version, columns, added):
+    conn.execute(
+        text(f'INSERT INTO {SCHEMA_VERSIONS_TABLE} (table_name, version, columns, added) '
+             'VALUES (:table_name, :version, :columns, :added)'),
+        {'table_name': table_name, 'version': version, 'columns': json.dumps(columns), 'added': json.dumps(added)},
+    )
+
+def _integer_columns(conn, df, table_name):
+    types = {c['name']: c['type'] for c in inspect(conn).get_columns(table_name)}
+    return [
+        col for col in df.columns
+        if isinstance(types.get(col), Integer) and pd.api.types.is_float_dtype(df[col])
+    ]
+
+def widen_integer_columns(conn, df, table_name):
+    """Change integer columns of table_name that df holds floats for to DOUBLE PRECISION; return their names.
+
+    Statement tables created from a batch of whole numbers got BIGINT line
+    items, which round or reject later decimal values. Postgres only; SQLite
+    stores the floats as they are.
+    """
+    if conn.dialect.name != 'postgresql' or not _integer_columns(conn, df, table_name):
+        return []
+    conn.execute(text('SELECT pg_advisory_xact_lock(hashtext(:name))'), {'name': f'schema:{table_name}'})
+    # Another shard may have widened them while this one waited
+    columns = _integer_columns(conn, df, table_name)
+    for col in columns:
+        conn.execute(text(f'ALTER TABLE "{table_name}" ALTER COLUMN "{col}" TYPE DOUBLE PRECISION'))
+    if columns:
+        print(f"{table_name}: widened columns {', '.join(columns)} to DOUBLE PRECISION.")
+    return columns
+
+def add_missing_columns(con, df, table_name):
+    """Add df's columns that table_name lacks with ALTER TABLE ... ADD COLUMN and return their names.
+
+    Existing rows get NULL in the new columns and are not rewritten. Each
+    change is recorded in schema_versions as a new version (the schema seen
+    before the first change is version 1). Integer columns that df now holds
+    floats for are widened first (see widen_integer_columns). Nothing happens
+    when the table does not exist yet. con may be an engine or a connection;
+    with a connection the change joins its transaction.
+    """
+    if isinstance(con, Engine):
+        with con.begin() as conn:
+            return add_missing_columns(conn, df, table_name)
+
+    inspector = inspect(con)
+    if not inspector.has_table(table_name):
+        return []
+    widen_integer_columns(con, df, table_name)
+    existing = [c['name'] for c in inspector.get_columns(table_name)]
+    missing = [c for c in df.columns if c not in set(existing)]
+    if not missing:
+        return []
+
+    if con.dialect.name == 'postgresql':
+        # Shards may find the same new line item at once; one of them adds it
+        con.execute(text('SELECT pg_advisory_xact_lock(hashtext(:name))'), {'name': f'schema:{table_name}'})
+        existing = [c['name'] for c in inspect(con).get_columns(table_name)]
+        missing = [c for c in df.columns if c not in set(existing)]
+        if not missing:
+            return []
+
+    for col in missing:
+        sql_type = column_type(df[col]).compile(dialect=con.dialect)
+        con.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN "{col}" {sql_type}'))
+
+    version, _ = schema_version(con, table_name)
+    if version == 0:
+        _record_version(con, table_name, 1, existing, [])
+        version = 1
+    _record_version(con, table_name, version + 1, existing + missing, missing)
+    print(f"{table_name}: added columns {', '.join(missing)} (schema version {version + 1}).")
+    return missing
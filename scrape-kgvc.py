@@ -1,25 +1,14 @@
 import os
 import pandas as pd
-from sqlalchemy import create_engine
+from db import get_engine
+from pg_copy import bulk_load
+from pg_merge import merge_load
+from periods import add_period_columns
+from screener import widen_statement_frame
+from snapshot import write_statement_snapshot
 from bs4 import BeautifulSoup
 import requests
 
-def create_pg_engine():
-    """Create a SQLAlchemy engine for PostgreSQL."""
-    try:
-        pg_user = os.getenv('PG_USER', 'concourse_user')
-        pg_password = os.getenv('PG_PASSWORD', 'concourse_pass')
-        pg_host = '192.168.56.1'
-        pg_database = os.getenv('PG_DATABASE', 'concourse')
-        pg_port = os.getenv('PG_PORT', '5432')
-
-        engine = create_engine(f'postgresql+psycopg2://{pg_user}:{pg_password}@{pg_host}:{pg_port}/{pg_database}')
-        print("PostgreSQL engine created successfully.")
-        return engine
-    except Exception as e:
-        print(f"Error creating PostgreSQL engine: {e}")
-        return None
-
 def fetch_login_csrf_token(session, login_url):
     """Fetch CSRF token from the login page."""
     login_page = session.get(login_url)
@@ -94,6 +83,9 @@ def save_to_csv(df, file_path):
         df_transposed.columns = [col.lower().replace(' ', '_').replace('+', '').replace('%', 'percent') for col in df_transposed.columns]
         #df_transposed.columns = [col.lower().replace(' ', '') for col in df_transposed.columns]
         df_transposed.rename(columns=lambda x: x.strip(), inplace=True)
+
+        # Typed fiscal period next to the "Mar 2024"/"TTM" label
+        add_period_columns(df_transposed, 'profit-loss')
  
         print(1)
         print(df_transposed.head())
@@ -107,8 +99,11 @@ def save_to_csv(df, file_path):
 def load_to_postgres(df_transposed, engine, table_name):
     """Load transposed DataFrame into PostgreSQL."""
     try:
-        df_transposed = df_transposed.fillna(0)
-        df_transposed.to_sql(table_name, con=engine, if_exists='replace', index=False)
+        df_transposed = widen_statement_frame(df_transposed, fill_value=0)
+        if os.getenv('LOAD_MODE') == 'merge':
+            merge_load(df_transposed, engine, table_name, ['date'])
+        else:
+            bulk_load(df_transposed, engine, table_name, if_exists='replace')
         print("Data successfully loaded into PostgreSQL.")
     except Exception as e:
         print(f"Error loading data into PostgreSQL: {e}")
@@ -119,7 +114,7 @@ def main():
     password = os.getenv("PASSWORD")
 
     # Create PostgreSQL engine
-    engine = create_pg_engine()
+    engine = get_engine()
     if not engine:
         return
 
@@ -139,6 +134,7 @@ def main():
                 csv_file_path = "reliance_data2.csv"
                 df_transposed = save_to_csv(df, csv_file_path)
                 if df_transposed is not None:
+                    write_statement_snapshot(df_transposed, 'reliance_data2')
                     load_to_postgres(df_transposed, engine, 'reliance_data2')
     else:
         print("Login failed.")
@@ -1,25 +1,10 @@
 import os
 import pandas as pd
-from sqlalchemy import create_engine
+from db import get_engine
+from pg_copy import bulk_load
 from bs4 import BeautifulSoup
 import requests
 
-def create_pg_engine():
-    """Create a SQLAlchemy engine for PostgreSQL."""
-    try:
-        pg_user = os.getenv('PG_USER', 'concourse_user')
-        pg_password = os.getenv('PG_PASSWORD', 'concourse_pass')
-        pg_host = '192.168.56.1'
-        pg_database = os.getenv('PG_DATABASE', 'concourse')
-        pg_port = os.getenv('PG_PORT', '5432')
-
-        engine = create_engine(f'postgresql+psycopg2://{pg_user}:{pg_password}@{pg_host}:{pg_port}/{pg_database}')
-        print("PostgreSQL engine created successfully.")
-        return engine
-    except Exception as e:
-        print(f"Error creating PostgreSQL engine: {e}")
-        return None
-
 def fetch_login_csrf_token(session, login_url):
     """Fetch CSRF token from the login page."""
     login_page = session.get(login_url)
@@ -82,7 +67,7 @@ def save_to_csv(df, file_path):
 def load_to_postgres(df, engine, table_name):
     """Load DataFrame into PostgreSQL."""
     try:
-        df.to_sql(table_name, con=engine, if_exists='replace', index=False)
+        bulk_load(df, engine, table_name, if_exists='replace')
         print("Data successfully loaded into PostgreSQL.")
     except Exception as e:
         print(f"Error loading data into PostgreSQL: {e}")
@@ -93,7 +78,7 @@ def main():
     password = os.getenv("PASSWORD")
     
     # Create PostgreSQL engine
-    engine = create_pg_engine()
+    engine = get_engine()
     if not engine:
         return
     
@@ -0,0 +1,273 @@
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from html_parsers import get_backend, bs4_table_cells, _section_html
+from http_cache import ResponseCache
+from periods import period_columns
+
+# SCREENER_BASE_URL points the scrapers at a stand-in server (see benchmarks/fake_screener.py)
+BASE_URL = os.getenv('SCREENER_BASE_URL', 'https://www.screener.in').rstrip('/')
+LOGIN_URL = f"{BASE_URL}/login/?"
+DASH_URL = f"{BASE_URL}/dash/"
+COMPANY_URL = BASE_URL + "/company/{company}/consolidated/"
+
+# Statement sections on a company page and the table each one is loaded into
+STATEMENT_SECTIONS = {
+    'profit-loss': 'ten_comp_pl',
+    'balance-sheet': 'ten_comp_bs',
+    'cash-flow': 'ten_comp_cf',
+    'quarters': 'ten_comp_quarters',
+    'ratios': 'ten_comp_ratios',
+}
+
+def fetch_login_csrf_token(session, login_url):
+    """Fetch CSRF token from the login page."""
+    login_page = session.get(login_url)
+    soup = BeautifulSoup(login_page.content, 'html.parser')
+    return soup.find('input', {'name': 'csrfmiddlewaretoken'})['value']
+
+def login(session, login_url, username, password, csrf_token):
+    """Perform login and return session response."""
+    login_payload = {
+        'username': username,
+        'password': password,
+        'csrfmiddlewaretoken': csrf_token
+    }
+    headers = {
+        'Referer': login_url,
+        'User-Agent': 'Mozilla/5.0'
+    }
+    return session.post(login_url, data=login_payload, headers=headers)
+
+def statement_digest(content):
+    """Hash only the statement sections so page chrome (tokens, ads) does not count as a change."""
+    digest = hashlib.sha256()
+    for section_id in STATEMENT_SECTIONS:
+        digest.update(_section_html(content, section_id) or b'')
+    return digest.hexdigest()
+
+def open_cache(namespace, cache_dir=None):
+    """Return a ResponseCache under SCRAPE_CACHE_DIR, or None when caching is not configured.
+
+    Each entry point passes its own namespace, since a page counts as unchanged
+    only relative to what that entry point last loaded.
+    """
+    cache_dir = cache_dir or os.getenv('SCRAPE_CACHE_DIR')
+    if not cache_dir:
+        return None
+    return ResponseCache(os.path.join(cache_dir, namespace), digest=statement_digest)
+
+def fetch_page(session, search_url, cache=None):
+    """Fetch the search URL and return the raw page content.
+
+    session may be a requests.Session or a transport.Transport. With a
+    ResponseCache the request is conditional and a 304 is answered from the
+    cached copy.
+    """
+    headers = cache.conditional_headers(search_url) if cache else {}
+    try:
+        search_response = session.get(search_url, headers=headers)
+    except requests.RequestException as e:
+        print(f"Failed to retrieve data from {search_url}: {e}")
+        return None
+    if cache and search_response.status_code == 304:
+        print(f"Data unchanged at {search_url}, using cached copy.")
+        return cache.store(search_url, search_response)
+    if search_response.status_code == 200:
+        print(f"Data retrieved successfully from {search_url}.")
+        if cache:
+            return cache.store(search_url, search_response)
+        return search_response.content
+    else:
+        print(f"Failed to retrieve data from {search_url}. Status Code: {search_response.status_code}")
+        return None
+
+def fetch_data(session, search_url):
+    """Fetch data from the search URL and return BeautifulSoup object."""
+    content = fetch_page(session, search_url)
+    if content is None:
+        return None
+    return BeautifulSoup(content, 'html.parser')
+
+def get_concurrency(default=4):
+    """Read the number of parallel page fetches from SCRAPE_CONCURRENCY."""
+    return max(1, int(os.getenv('SCRAPE_CONCURRENCY', default)))
+
+def iter_pages(session, search_urls, max_workers=None, cache=None):
+    """Fetch URLs concurrently and yield (url, page content) in order.
+
+    At most 2 * max_workers pages are fetched ahead of the consumer, so memory
+    stays bounded however many URLs there are.
+    """
+    if max_workers is None:
+        max_workers = get_concurrency()
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for url in search_urls:
+            pending.append((url, executor.submit(fetch_page, session, url, cache)))
+            if len(pending) >= 2 * max_workers:
+                url, future = pending.popleft()
+                yield url, future.result()
+        while pending:
+            url, future = pending.popleft()
+            yield url, future.result()
+
+def fetch_all_data(session, search_urls, max_workers=None, cache=None):
+    """Fetch many URLs concurrently over one session.
+
+    Raw page contents are returned in the same order as search_urls, with None
+    for pages that could not be retrieved. max_workers=1 fetches serially.
+    """
+    return [page for _, page in iter_pages(session, search_urls, max_workers, cache)]
+
+def parse_table(page, section_id, backend=None):
+    """Parse the table of the given section and return DataFrame.
+
+    page is raw HTML or a BeautifulSoup object. backend picks the HTML parser
+    (see html_parsers.PARSER_BACKENDS); the DataFrame is the same for all of them.
+    """
+    _, table_cells = get_backend(backend)
+    if isinstance(page, BeautifulSoup):
+        table_cells = bs4_table_cells
+    cells = table_cells(page, section_id)
+    if cells:
+        headers, rows = cells
+        row_data = []
+
+        for cols in rows:
+            if len(cols) == len(headers):
+                row_data.append(cols)
+            else:
+                print(f"Row data length mismatch: {cols}")
+
+        df = pd.DataFrame(row_data, columns=headers)
+        if not df.empty:
+            df.columns = ['Narration'] + df.columns[1:].tolist()
+        df = df.reset_index(drop=True)
+        return df
+    else:
+        print(f"Failed to find the {section_id} data table.")
+        return None
+
+def parse_sections(page, section_ids=STATEMENT_SECTIONS, backend=None):
+    """Parse every requested section of one company page and return {section_id: DataFrame}.
+
+    Sections missing from the page are skipped.
+    """
+    backend, _ = get_backend(backend)
+    if backend == 'bs4' and not isinstance(page, BeautifulSoup):
+        page = BeautifulSoup(page, 'html.parser')  # Build the tree once for all sections
+    frames = {}
+    for section_id in section_ids:
+        df = parse_table(page, section_id, backend)
+        if df is not None:
+            frames[section_id] = df
+    return frames
+
+def to_numeric_block(values):
+    """Strip ',' and '%' from a 2-D array of cell strings and parse it as floats in one pass.
+
+    Returns the float array (NaN where a cell is not a number) and a mask of
+    the columns whose cells are all plain integers, which pd.to_numeric would
+    have turned into int64 columns.
+    """
+    cells = np.char.replace(np.char.replace(values.astype(str), ',', ''), '%', '')
+    numbers = pd.to_numeric(pd.Series(cells.ravel(), dtype=object), errors='coerce')
+    numbers = numbers.to_numpy(dtype=float, copy=True).reshape(cells.shape)
+    integral = np.char.isdigit(np.char.lstrip(cells, '-')).all(axis=0)
+    return numbers, integral
+
+# Declared schema of the transposed statement frames: line items are the
+# narrowest of int32/int64/float32/float64 that holds every value exactly,
+# and the repeated labels below are categoricals; period_end is datetime64
+CATEGORY_COLUMNS = ('date', 'period_type', 'company_name')
+LABEL_COLUMNS = ('date', 'period_end', 'period_type', 'company_name')
+INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+def compact_column(values, integral=False):
+    """Return values (a float64 array) in the narrowest dtype that keeps them exact.
+
+    Integral columns become int32 when in range, others float32 when every
+    value survives the round trip at screener's two decimals, else float64.
+    """
+    if integral:
+        in_range = values.size == 0 or (values.min() >= INT32_RANGE[0] and values.max() <= INT32_RANGE[1])
+        return values.astype(np.int32 if in_range else np.int64)
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64).round(2), values, equal_nan=True):
+        return narrow
+    return values
+
+def concat_statements(frames):
+    """Concatenate per-company statement frames and keep the compact schema.
+
+    Categoricals are rebuilt with the union of their categories, since
+    pd.concat turns differing categories into object columns, and columns
+    that came out as float64 (a line item missing for some companies) are
+    narrowed again.
+    """
+    frames = list(frames)
+    merged = pd.concat(frames, ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        if all(col in df.columns for df in frames):
+            merged[col] = pd.api.types.union_categoricals([df[col] for df in frames], ignore_order=True)
+    for col in merged.columns[merged.dtypes == np.float64]:
+        merged[col] = compact_column(merged[col].to_numpy())
+    return merged
+
+def widen_statement_frame(df, fill_value=None):
+    """Copy of a compact statement frame with the column types loaders expect.
+
+    Every line item becomes float64, so tables get DOUBLE PRECISION columns
+    even when the batch that creates them only holds whole numbers; a BIGINT
+    column would round (or reject) later decimal values. float32 values are
+    rounded back to two decimals, so 0.1 is stored as 0.1 and row hashes
+    match earlier loads. period_end becomes dates, for DATE columns. With
+    fill_value, missing line item values are filled; the label columns are
+    left alone.
+    """
+    floats = list(df.columns[df.dtypes == np.float32])
+    integers = [col for col in df.columns if col not in LABEL_COLUMNS and pd.api.types.is_integer_dtype(df[col])]
+    df = df.astype({col: np.float64 for col in floats + integers})
+    df[floats] = df[floats].round(2)
+    if 'period_end' in df.columns:
+        df['period_end'] = df['period_end'].dt.date
+    if fill_value is not None:
+        values = [col for col in df.columns if col not in LABEL_COLUMNS]
+        df[values] = df[values].fillna(fill_value)
+    return df
+
+def clean_column_name(name):
+    """Turn a line item label into a column name: lowercase, '_' for spaces, no '+', '%' as 'percent'."""
+    return name.lower().replace(' ', '_').replace('+', '').replace('%', 'percent').strip()
+
+def save_to_transposed_csv(df, company_name, all_data_list, statement=None):
+    """Append transposed DataFrame to a list with company name.
+
+    statement is the section id, used to type the periods (see periods.py).
+    """
+    if df is not None:
+        # Parse every cell at once, transposed so dates are rows and line items columns
+        numbers, integral = to_numeric_block(df.iloc[:, 1:].to_numpy().T)
+        numbers[np.isnan(numbers)] = 0  # Fill NaN values
+
+        # Typed fiscal period next to the "Mar 2024"/"TTM" label
+        period_end, period_type = period_columns(tuple(df.columns[1:]), statement)
+        columns = {0: pd.Categorical(df.columns[1:]), 1: period_end, 2: period_type}
+        for i in range(numbers.shape[1]):
+            columns[i + 3] = compact_column(numbers[:, i], integral[i])
+        df_transposed = pd.DataFrame(columns)
+
+        # Clean column names: lowercase, replace spaces and symbols with underscores
+        names = ['Date', 'period_end', 'period_type'] + df['Narration'].tolist()
+        df_transposed.columns = [clean_column_name(col) for col in names]
+
+        # Add company name as a new column
+        df_transposed['company_name'] = pd.Categorical.from_codes(np.zeros(len(df_transposed), dtype=np.int8), [company_name])
+
+        all_data_list.append(df_transposed)  # Append DataFrame to the list
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+import requests
+from screener import LOGIN_URL, DASH_URL, fetch_login_csrf_token, login
+
+SESSION_COOKIE = 'sessionid'
+
+def save_session(session, store_path):
+    """Serialize the session cookie jar to store_path (readable by the owner only)."""
+    cookies = [
+        {
+            'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+            'expires': c.expires, 'secure': c.secure,
+        }
+        for c in session.cookies
+    ]
+    directory = os.path.dirname(store_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd = os.open(store_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'saved_at': time.time(), 'cookies': cookies}, f)
+    print(f"Session saved to {store_path}.")
+
+def load_session(store_path):
+    """Return a requests.Session with the stored cookies, or None if missing or expired."""
+    if not store_path or not os.path.exists(store_path):
+        return None
+    try:
+        with open(store_path) as f:
+            stored = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading stored session: {e}")
+        return None
+
+    now = time.time()
+    cookies = [c for c in stored['cookies'] if c['expires'] is None or c['expires'] > now]
+    if not any(c['name'] == SESSION_COOKIE for c in cookies):
+        print("Stored session has expired.")
+        return None
+
+    session = requests.Session()
+    for c in cookies:
+        session.cookies.set(
+            c['name'], c['value'], domain=c['domain'], path=c['path'],
+            expires=c['expires'], secure=c['secure']
+        )
+    print(f"Reusing stored session from {store_path}.")
+    return session
+
+def _session_cookie(session):
+    for c in session.cookies:
+        if c.name == SESSION_COOKIE:
+            return c.value
+    return None
+
+def _do_login(session, username, password, store_path):
+    """Log session in and store it; return True on success."""
+    csrf_token = fetch_login_csrf_token(session, LOGIN_URL)
+    response = login(session, LOGIN_URL, username, password, csrf_token)
+    if response.url != DASH_URL:
+        return False
+    if store_path:
+        save_session(session, store_path)
+    return True
+
+def install_relogin_hook(session, username, password, store_path=None):
+    """Log in again and retry once whenever a request is redirected to /login/.
+
+    Concurrent requests that hit an expired session share one re-login.
+    """
+    lock = threading.Lock()
+
+    def relogin(response, *args, **kwargs):
+        request = response.request
+        if not (response.is_redirect and '/login/' in response.headers.get('Location', '')):
+            return response
+        if getattr(request, '_relogin_attempted', False):
+            return response
+
+        # Read the redirect so its pooled connection is free for the login requests
+        response.content
+        with lock:
+            current = _session_cookie(session)
+            # Another thread may already have logged in again since this request was sent
+            if not current or f"{SESSION_COOKIE}={current}" in request.headers.get('Cookie', ''):
+                print("Session expired, logging in again.")
+                session.cookies.clear()
+                if not _do_login(session, username, password, store_path):
+                    print("Re-login failed.")
+                    return response
+
+        retry = request.copy()
+        retry._relogin_attempted = True
+        retry.headers.pop('Cookie', None)
+        retry.prepare_cookies(session.cookies)
+        return session.send(retry, **kwargs)
+
+    session.hooks['response'].append(relogin)
+    return session
+
+def login_session(username, password, store_path=None):
+    """Return a logged-in session, reusing the stored one when it is still valid.
+
+    store_path defaults to SCREENER_SESSION_FILE; without it every call logs in.
+    Returns None if the login fails.
+    """
+    store_path = store_path or os.getenv('SCREENER_SESSION_FILE')
+    session = load_session(store_path)
+    if session is None:
+        session = requests.Session()
+        if not _do_login(session, username, password, store_path):
+            return None
+    return install_relogin_hook(session, username, password, store_path)
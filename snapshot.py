@@ -0,0 +1,82 @@
+import os
+from screener import widen_statement_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, snapshots are skipped without it
+    pa = None
+
+# Label columns of the transposed statement tables; every other column is a line item
+STATEMENT_KEYS = ('date', 'period_end', 'period_type', 'company_name')
+
+def get_snapshot_dir():
+    """Directory for Parquet snapshots from SNAPSHOT_DIR; unset disables them."""
+    return os.getenv('SNAPSHOT_DIR') or None
+
+def statement_schema(columns):
+    """Arrow schema for a transposed statement frame: string labels, date period_end, float64 line items."""
+    fields = []
+    for col in columns:
+        if col in ('company_name', 'period_type'):
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        elif col == 'period_end':
+            fields.append(pa.field(col, pa.date32()))
+        elif col in STATEMENT_KEYS:
+            fields.append(pa.field(col, pa.string()))
+        else:
+            fields.append(pa.field(col, pa.float64()))
+    return pa.schema(fields)
+
+# Fiscal-year OHLC rows from comp-yfinanceapi.py
+OHLC_SCHEMA = pa.schema([
+    pa.field('Date', pa.string()),
+    pa.field('Company', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('period_end', pa.date32()),
+    pa.field('period_type', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('Open', pa.float64()),
+    pa.field('High', pa.float64()),
+    pa.field('Low', pa.float64()),
+    pa.field('Close', pa.float64()),
+    pa.field('Volume', pa.int64()),
+]) if pa is not None else None
+
+def write_snapshot(df, name, schema, partition_by=None, snapshot_dir=None):
+    """Write df as a compressed Parquet dataset under <SNAPSHOT_DIR>/<name>/.
+
+    With partition_by the files are split into <column>=<value> directories,
+    and only the partitions present in df are replaced, so batches and shards
+    each rewrite their own companies. schema fixes the column types instead
+    of inferring them per file. Compression comes from SNAPSHOT_COMPRESSION
+    (zstd by default). Returns the dataset path, or None when skipped.
+    """
+    snapshot_dir = snapshot_dir or get_snapshot_dir()
+    if not snapshot_dir or df is None or df.empty:
+        return None
+    if pa is None:
+        print("pyarrow is not installed, skipping the Parquet snapshot.")
+        return None
+
+    path = os.path.join(snapshot_dir, name)
+    try:
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        pq.write_to_dataset(
+            table, path,
+            partition_cols=[partition_by] if partition_by else None,
+            compression=os.getenv('SNAPSHOT_COMPRESSION', 'zstd'),
+            existing_data_behavior='delete_matching',
+            basename_template='part-{i}.parquet',
+        )
+        print(f"Parquet snapshot written to {path}")
+        return path
+    except Exception as e:
+        print(f"Error writing Parquet snapshot {path}: {e}")
+        return None
+
+def write_statement_snapshot(df, table_name, snapshot_dir=None):
+    """Snapshot a transposed statement frame, one partition per company when it has company_name."""
+    if pa is None or df is None:
+        return write_snapshot(df, table_name, None, snapshot_dir=snapshot_dir)
+    df = widen_statement_frame(df)  # float64 in every file, whatever the in-memory dtype
+    partition_by = 'company_name' if 'company_name' in df.columns else None
+    return write_snapshot(df, table_name, statement_schema(df.columns), partition_by, snapshot_dir)
@@ -0,0 +1,121 @@
+import os
+from db import get_engine
+from screener import (
+    COMPANY_URL,
+    get_concurrency, open_cache, fetch_all_data, parse_sections, save_to_transposed_csv,
+    concat_statements, widen_statement_frame
+)
+from session_store import login_session
+from transport import Transport
+from change_detection import load_changes
+from pg_copy import bulk_load
+from pg_merge import merge_load
+from periods import index_periods
+from universe import parse_universe_args, companies_for
+from fundamentals import get_fundamentals_table, load_long_frames, to_long
+from snapshot import write_statement_snapshot
+from streaming import SCOPED_MODES, get_batch_size, stream_statements
+
+def load_to_postgres(df_transposed, engine, table_name, mode='replace'):
+    """Load transposed DataFrame into PostgreSQL."""
+    try:
+        # Loads get int64/float64 line items and a DATE period_end from the compact frame
+        df_transposed = widen_statement_frame(df_transposed, fill_value=0)
+        # mode is 'replace', 'append' (later streaming batches), 'delta' or 'merge'
+        if mode == 'delta':
+            # Write only inserted, updated and deleted rows so CDC sees real changes
+            load_changes(df_transposed, engine, table_name)
+        elif mode == 'merge':
+            # Upsert through a staging table; only these companies' stale rows are deleted
+            merge_load(df_transposed, engine, table_name, ['company_name', 'date'], scope_column='company_name')
+        else:
+            bulk_load(df_transposed, engine, table_name, if_exists=mode)
+        with engine.begin() as conn:
+            index_periods(conn, table_name)
+        print(f"Data successfully loaded into PostgreSQL table '{table_name}'.")
+        return True
+    except Exception as e:
+        print(f"Error loading data into PostgreSQL: {e}")
+        return False
+
+def scrape_statements(sections, cache_namespace, description):
+    """Run a statement entry point: log in once, fetch each company page once and load sections.
+
+    sections maps section ids to table names, cache_namespace names the page
+    cache (see open_cache) and description is the command line help.
+    """
+    username = os.getenv("USERNAME")
+    password = os.getenv("PASSWORD")
+
+    args = parse_universe_args(description)
+
+    # This shard's companies from the shared universe
+    companies = companies_for(args, get_engine)['symbol'].tolist()
+
+    # Shards share the tables, so each one may only touch its own companies' rows
+    load_mode = os.getenv('LOAD_MODE', 'replace')
+    if args.shard_count > 1 and load_mode not in SCOPED_MODES:
+        load_mode = 'delta'
+
+    # One list of per-company frames for each statement section
+    all_data = {section_id: [] for section_id in sections}
+    long_frames = []
+    # Also keep the long fundamentals table up to date when FUNDAMENTALS_TABLE is set
+    long_table = get_fundamentals_table()
+
+    # Log in, or reuse the session stored by an earlier run (SCREENER_SESSION_FILE)
+    session = login_session(username, password)
+    if not session:
+        print("Login failed.")
+        return
+
+    # Rate-limited, retrying transport with one pooled connection per worker
+    concurrency = get_concurrency()
+    transport = Transport(session, concurrency=concurrency)
+    cache = open_cache(cache_namespace)
+
+    # Streaming mode: flush every STREAM_BATCH_SIZE companies to keep memory flat
+    batch_size = get_batch_size()
+    if batch_size:
+        engine = get_engine()
+        if engine:
+            load = lambda df, table_name, mode: load_to_postgres(df, engine, table_name, mode)
+            load_long = (lambda frames: load_long_frames(frames, engine)) if long_table else None
+            stream_statements(transport, companies, sections, load, batch_size, concurrency, cache, load_mode, load_long)
+        return
+
+    # Fetch pages concurrently (SCRAPE_CONCURRENCY), then parse in company order
+    search_urls = [COMPANY_URL.format(company=company) for company in companies]
+    pages = fetch_all_data(transport, search_urls, max_workers=concurrency, cache=cache)
+
+    # Nothing to parse or load when every page matches the cached copy; new
+    # validators from 200s with unchanged statements are still remembered
+    if cache and not cache.changed:
+        print("No company data changed since the last run.")
+        cache.commit()
+        return
+
+    # Scoped loads leave the other companies' rows alone, so only changed pages are needed
+    only_changed = cache is not None and load_mode in SCOPED_MODES
+    for company, url, page in zip(companies, search_urls, pages):
+        if page and (not only_changed or url in cache.changed):
+            for section_id, df in parse_sections(page, sections).items():
+                save_to_transposed_csv(df, company, all_data[section_id], section_id)
+                if long_table:
+                    long_frames.append(to_long(df, company, section_id))
+
+    # Concatenate each section and load it into its own table
+    engine = get_engine()
+    if not engine:
+        return
+    loaded = True
+    for section_id, table_name in sections.items():
+        if all_data[section_id]:
+            merged_df = concat_statements(all_data[section_id])
+            write_statement_snapshot(merged_df, table_name)
+            loaded = load_to_postgres(merged_df, engine, table_name, load_mode) and loaded
+    if long_table:
+        loaded = load_long_frames(long_frames, engine) and loaded
+    # Only remember these pages once every table holds their data
+    if loaded and cache:
+        cache.commit()
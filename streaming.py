@@ -0,0 +1,78 @@
+import os
+from itertools import islice
+from screener import COMPANY_URL, concat_statements, iter_pages, parse_sections, save_to_transposed_csv
+from fundamentals import to_long
+from snapshot import write_statement_snapshot
+
+# Load modes that only touch the loaded companies' rows
+SCOPED_MODES = ('delta', 'merge')
+
+def get_batch_size(default=0):
+    """Companies per database flush from STREAM_BATCH_SIZE; 0 disables streaming."""
+    return max(0, int(os.getenv('STREAM_BATCH_SIZE', default)))
+
+def iter_batches(items, batch_size):
+    """Yield lists of at most batch_size items from an iterable."""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def stream_statements(session, companies, sections, load, batch_size, max_workers=None, cache=None, mode='replace',
+                      load_long=None):
+    """Fetch, parse and load companies batch by batch instead of all at once.
+
+    sections maps section ids to table names. load(df, table_name, mode) writes
+    one frame and returns True on success. In delta or merge mode every batch
+    is loaded for its own companies only, and pages unchanged in the cache
+    are skipped. Otherwise the first batch written to a table replaces it and
+    later ones append. Each loaded batch is committed to the cache, so a crash
+    only repeats the unfinished batches. With load_long(frames), each batch's
+    to_long() frames are also written to the long fundamentals table. Returns
+    True if every batch loaded.
+    """
+    replaced = set()
+    search_urls = (COMPANY_URL.format(company=company) for company in companies)
+    fetched = zip(companies, iter_pages(session, search_urls, max_workers, cache))
+
+    for number, batch in enumerate(iter_batches(fetched, batch_size), start=1):
+        urls = [url for _, (url, _) in batch]
+        if cache and mode in SCOPED_MODES and not any(url in cache.changed for url in urls):
+            print(f"Batch {number}: no company data changed.")
+            cache.commit(urls)
+            continue
+
+        frames = {section_id: [] for section_id in sections}
+        long_frames = []
+        for company, (url, page) in batch:
+            # Scoped loads leave unchanged companies' rows alone, so skip their pages
+            if page and not (cache and mode in SCOPED_MODES and url not in cache.changed):
+                for section_id, df in parse_sections(page, sections).items():
+                    save_to_transposed_csv(df, company, frames[section_id], section_id)
+                    if load_long:
+                        long_frames.append(to_long(df, company, section_id))
+
+        for section_id, table_name in sections.items():
+            if not frames[section_id]:
+                continue
+            if mode in SCOPED_MODES:
+                table_mode = mode
+            else:
+                table_mode = 'append' if table_name in replaced else 'replace'
+            merged_df = concat_statements(frames[section_id])
+            write_statement_snapshot(merged_df, table_name)
+            if not load(merged_df, table_name, table_mode):
+                print(f"Batch {number}: loading {table_name} failed, stopping.")
+                return False
+            replaced.add(table_name)
+
+        if load_long and not load_long(long_frames):
+            print(f"Batch {number}: loading fundamentals failed, stopping.")
+            return False
+
+        if cache:
+            cache.commit(urls)
+        print(f"Batch {number}: {len(batch)} companies loaded.")
+    return True
@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fake_screener import start_server
+
+# screener.py reads SCREENER_BASE_URL at import time, so the fake server must be up first
+SERVER, BASE_URL = start_server()
+os.environ['SCREENER_BASE_URL'] = BASE_URL
+
+from session_store import login_session
+
+def run_with_timeout(func, timeout=30):
+    """Run func in a thread and fail instead of hanging the suite if it never returns."""
+    result = {}
+
+    def target():
+        try:
+            result['value'] = func()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"still running after {timeout}s"
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+def stale_session(store_path):
+    """Log in and store the session, then make the server forget it."""
+    assert login_session('user', 'secret', store_path) is not None
+    SERVER.state.sessions.clear()
+    return login_session('user', 'secret', store_path)
+
+def statement_page(sales, note=''):
+    """A company page whose profit-loss section holds one Sales row, plus some page chrome."""
+    header = '<tr><th></th><th>Mar 2023</th><th>Mar 2024</th></tr>'
+    row = "<tr><td class='text'>Sales</td>" + ''.join(f'<td>{v}</td>' for v in sales) + '</tr>'
+    return f"<html><body><p>{note}</p><section id='profit-loss'><table>{header}{row}</table></section></body></html>"
+
+@pytest.fixture
+def pages(tmp_path, monkeypatch):
+    """Serve statement_page()s from the fake server: pages(ticker, sales, note='')."""
+    pages_dir = tmp_path / 'pages'
+    pages_dir.mkdir()
+    monkeypatch.setattr(SERVER.state, 'pages_dir', str(pages_dir))
+
+    def write(ticker, sales, note=''):
+        (pages_dir / f'{ticker}.html').write_text(statement_page(sales, note))
+    return write
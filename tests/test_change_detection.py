@@ -0,0 +1,34 @@
+import pandas as pd
+from change_detection import diff_rows, row_hashes
+
+def statement(rows):
+    return pd.DataFrame(rows, columns=['company_name', 'date', 'sales', 'profit'])
+
+def keys(df):
+    return sorted(map(tuple, df.to_numpy().tolist()))
+
+def test_diff_rows():
+    old = statement([
+        ['A', 'Mar 2023', 10, 1.0],
+        ['A', 'Mar 2024', 20, 2.0],
+        ['B', 'Mar 2024', 30, 3.0],
+    ])
+    new = statement([
+        ['A', 'Mar 2023', 10, 1.0],
+        ['A', 'Mar 2024', 20, 2.5],
+        ['C', 'Mar 2024', 40, 4.0],
+    ])
+
+    inserted, updated, deleted = diff_rows(row_hashes(new), row_hashes(old))
+
+    assert keys(inserted) == [('C', 'Mar 2024')]
+    assert keys(updated) == [('A', 'Mar 2024')]
+    assert keys(deleted) == [('B', 'Mar 2024')]
+
+def test_row_hashes_ignore_column_order():
+    df = statement([['A', 'Mar 2024', 20, 2.0]])
+    reordered = df[['profit', 'date', 'sales', 'company_name']]
+
+    inserted, updated, deleted = diff_rows(row_hashes(reordered), row_hashes(df))
+
+    assert inserted.empty and updated.empty and deleted.empty
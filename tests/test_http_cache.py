@@ -0,0 +1,118 @@
+import sys
+import pandas as pd
+import pytest
+import requests
+from sqlalchemy import create_engine
+import statements
+from conftest import statement_page
+from http_cache import ResponseCache
+from screener import COMPANY_URL, fetch_page, open_cache, statement_digest
+from session_store import login_session
+
+URL = 'http://example.test/company/A/consolidated/'
+
+def response(status_code, content=b'', etag=None):
+    r = requests.Response()
+    r.status_code = status_code
+    r._content = content
+    if etag:
+        r.headers['ETag'] = etag
+    return r
+
+def test_entries_are_written_on_commit(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+
+    assert cache.store(URL, response(200, b'v1', '"1"')) == b'v1'
+    assert cache.changed == {URL}
+    assert ResponseCache(str(tmp_path)).lookup(URL) is None
+
+    cache.commit()
+    cache = ResponseCache(str(tmp_path))
+    assert cache.conditional_headers(URL) == {'If-None-Match': '"1"'}
+    assert cache.body(URL) == b'v1'
+
+def test_unchanged_content_and_304s(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store(URL, response(200, b'v1', '"1"'))
+    cache.commit()
+
+    cache = ResponseCache(str(tmp_path))
+    assert cache.store(URL, response(304)) == b'v1'
+    assert cache.store(URL, response(200, b'v1', '"2"')) == b'v1'
+    assert cache.changed == set()
+    cache.store(URL, response(200, b'v2', '"3"'))
+    assert cache.changed == {URL}
+
+def test_commit_only_given_urls(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    other = URL.replace('/A/', '/B/')
+    cache.store(URL, response(200, b'a'))
+    cache.store(other, response(200, b'b'))
+
+    cache.commit([other])
+
+    assert ResponseCache(str(tmp_path)).lookup(URL) is None
+    assert ResponseCache(str(tmp_path)).lookup(other) is not None
+
+def test_statement_digest_ignores_page_chrome():
+    page = statement_page(['1', '2'], note='ad').encode()
+    assert statement_digest(page) == statement_digest(statement_page(['1', '2'], note='other ad').encode())
+    assert statement_digest(page) != statement_digest(statement_page(['1', '3']).encode())
+
+def test_conditional_get_against_the_fake_server(tmp_path, pages, capsys):
+    pages('COND', ['1', '2'])
+    session = login_session('user', 'secret')
+    url = COMPANY_URL.format(company='COND')
+    cache = open_cache('test', str(tmp_path))
+    fetch_page(session, url, cache)
+    cache.commit()
+
+    cache = open_cache('test', str(tmp_path))
+    assert b'Sales' in fetch_page(session, url, cache)
+    assert f"Data unchanged at {url}" in capsys.readouterr().out
+    assert cache.changed == set()
+
+@pytest.fixture
+def scrape(tmp_path, monkeypatch):
+    """Run scrape_statements in merge mode for CA and CB with a page cache; returns (first Sales cells parsed, stored rows)."""
+    universe = tmp_path / 'universe.csv'
+    universe.write_text('symbol\nCA\nCB\n')
+    engine = create_engine('sqlite://')
+    monkeypatch.setattr(statements, 'get_engine', lambda: engine)
+    monkeypatch.setattr(sys, 'argv', ['comp-pl.py', '--universe', str(universe)])
+    for name, value in {'USERNAME': 'user', 'PASSWORD': 'secret', 'LOAD_MODE': 'merge',
+                        'SCRAPE_CACHE_DIR': str(tmp_path / 'cache')}.items():
+        monkeypatch.setenv(name, value)
+    for name in ['STREAM_BATCH_SIZE', 'FUNDAMENTALS_TABLE', 'SCREENER_SESSION_FILE', 'SNAPSHOT_DIR']:
+        monkeypatch.delenv(name, raising=False)
+
+    parsed = []
+    parse_sections = statements.parse_sections
+
+    def run():
+        parsed.clear()
+        statements.scrape_statements({'profit-loss': 'pl'}, 'pl', 'test')
+        return sorted(parsed), pd.read_sql('SELECT company_name, date, sales FROM pl ORDER BY 1, 2', engine)
+
+    def spy(page, section_ids):
+        parsed.append(page.decode().split('<td>')[1].split('<')[0])
+        return parse_sections(page, section_ids)
+    monkeypatch.setattr(statements, 'parse_sections', spy)
+    return run
+
+def test_scrape_parses_only_changed_pages(pages, scrape, capsys):
+    pages('CA', ['1', '2'])
+    pages('CB', ['3', '4'])
+    assert scrape()[0] == ['1', '3']
+
+    # New page chrome: a 200 with a new ETag, but the same statements
+    pages('CA', ['1', '2'], note='new ad')
+    assert scrape()[0] == []
+    assert 'No company data changed' in capsys.readouterr().out
+
+    # The new ETag was remembered, so this run gets a 304 for CA
+    pages('CB', ['3', '5'])
+    parsed, stored = scrape()
+    assert 'Data unchanged at ' + COMPANY_URL.format(company='CA') in capsys.readouterr().out
+    assert parsed == ['3']
+    assert stored['sales'].tolist() == [1.0, 2.0, 3.0, 5.0]
@@ -0,0 +1,20 @@
+import pandas as pd
+from periods import ANNUAL, INTERIM, QUARTERLY, TTM, parse_periods
+
+def test_annual_statement_periods():
+    period_end, period_type = parse_periods(['Mar 2022', 'Sep 2022', 'Mar 2023', 'TTM', 'Notes'])
+
+    assert list(period_end[:3]) == [pd.Timestamp('2022-03-31'), pd.Timestamp('2022-09-30'), pd.Timestamp('2023-03-31')]
+    # TTM takes the latest dated period; other labels get NaT
+    assert period_end[3] == pd.Timestamp('2023-03-31')
+    assert pd.isna(period_end[4])
+    assert list(period_type) == [ANNUAL, INTERIM, ANNUAL, TTM, None]
+
+def test_year_end_is_the_most_common_month():
+    _, period_type = parse_periods(['Dec 2021', 'Dec 2022', 'Mar 2023', 'Dec 2023'])
+    assert list(period_type) == [ANNUAL, ANNUAL, INTERIM, ANNUAL]
+
+def test_quarterly_section():
+    period_end, period_type = parse_periods([' Jun 2023', 'Sep 2023 ', 'Dec 2023'], 'quarters')
+    assert list(period_end) == [pd.Timestamp('2023-06-30'), pd.Timestamp('2023-09-30'), pd.Timestamp('2023-12-31')]
+    assert list(period_type) == [QUARTERLY] * 3
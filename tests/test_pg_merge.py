@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from pg_merge import merge_load
+
+KEYS = ['company_name', 'date']
+
+@pytest.fixture
+def engine():
+    return create_engine('sqlite://')
+
+def statement(rows, columns=('company_name', 'date', 'sales')):
+    return pd.DataFrame(rows, columns=list(columns))
+
+def stored(engine):
+    return pd.read_sql('SELECT * FROM t ORDER BY company_name, date', engine)
+
+def test_merge_creates_then_leaves_unchanged_rows_alone(engine):
+    df = statement([['A', 'Mar 2023', 1.0], ['A', 'Mar 2024', None], ['B', 'Mar 2024', 3.0]])
+
+    assert merge_load(df, engine, 't', KEYS, scope_column='company_name') == (3, 0)
+    assert merge_load(df, engine, 't', KEYS, scope_column='company_name') == (0, 0)
+    pd.testing.assert_frame_equal(stored(engine), df)
+
+def test_merge_updates_and_deletes_within_scope(engine):
+    merge_load(statement([['A', 'Mar 2023', 1.0], ['A', 'Mar 2024', 2.0], ['B', 'Mar 2024', 3.0]]), engine, 't', KEYS)
+
+    upserted, deleted = merge_load(statement([['A', 'Mar 2023', 9.0]]), engine, 't', KEYS, scope_column='company_name')
+
+    assert (upserted, deleted) == (1, 1)
+    # B is outside the merged companies and keeps its row
+    pd.testing.assert_frame_equal(stored(engine), statement([['A', 'Mar 2023', 9.0], ['B', 'Mar 2024', 3.0]]))
+
+def test_merge_without_scope_deletes_everything_missing(engine):
+    merge_load(statement([['A', 'Mar 2023', 1.0], ['B', 'Mar 2024', 3.0]]), engine, 't', KEYS)
+
+    assert merge_load(statement([['A', 'Mar 2023', 1.0]]), engine, 't', KEYS) == (0, 1)
+    assert merge_load(statement([['C', 'Mar 2023', 1.0]]), engine, 't', KEYS, delete_missing=False) == (1, 0)
+    assert list(stored(engine)['company_name']) == ['A', 'C']
+
+def test_merge_adds_new_columns(engine):
+    merge_load(statement([['A', 'Mar 2023', 1.0]]), engine, 't', KEYS)
+
+    df = statement([['A', 'Mar 2023', 1.0, 5.0]], ('company_name', 'date', 'sales', 'profit'))
+    assert merge_load(df, engine, 't', KEYS) == (1, 0)
+    pd.testing.assert_frame_equal(stored(engine), df)
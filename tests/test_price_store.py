@@ -0,0 +1,61 @@
+import importlib.util
+import os
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from conftest import ROOT
+from ohlc import aggregate_ohlc
+from price_store import last_stored_dates, recompute_bars, update_price_store
+from prices import synthetic_prices
+
+SYMBOLS = ['AAA.NS', 'BBB.NS']
+
+@pytest.fixture
+def engine():
+    return create_engine('sqlite://')
+
+def stored(engine):
+    return pd.read_sql('SELECT * FROM prices ORDER BY symbol, "Date"', engine, parse_dates=['Date'])
+
+def test_updates_append_only_the_missing_days(engine):
+    first_new = update_price_store(SYMBOLS, engine, 'prices', '2024-01-01', '2024-03-01', 'synthetic')
+    assert first_new == {s: pd.Timestamp('2024-01-01') for s in SYMBOLS}
+
+    # Nothing new on the same day, nor over a weekend
+    assert update_price_store(SYMBOLS, engine, 'prices', '2024-01-01', '2024-03-01', 'synthetic') == {}
+    update_price_store(SYMBOLS, engine, 'prices', '2024-01-01', '2024-03-19', 'synthetic')
+    assert update_price_store(SYMBOLS, engine, 'prices', '2024-01-01', '2024-03-18', 'synthetic') == {}
+
+    first_new = update_price_store(SYMBOLS + ['CCC.NS'], engine, 'prices', '2024-01-01', '2024-04-05', 'synthetic')
+
+    assert first_new == {'AAA.NS': pd.Timestamp('2024-03-19'), 'BBB.NS': pd.Timestamp('2024-03-19'),
+                         'CCC.NS': pd.Timestamp('2024-01-01')}
+    expected = synthetic_prices(SYMBOLS + ['CCC.NS'], '2024-01-01', '2024-04-05')
+    pd.testing.assert_frame_equal(stored(engine), expected, check_dtype=False)
+    assert last_stored_dates(engine, 'prices', ['AAA.NS']) == {'AAA.NS': pd.Timestamp('2024-04-04')}
+
+def test_recompute_bars_matches_a_full_aggregation(engine):
+    update_price_store(SYMBOLS, engine, 'prices', '2022-04-01', '2024-03-01', 'synthetic')
+    first_new = update_price_store(SYMBOLS, engine, 'prices', '2022-04-01', '2024-05-01', 'synthetic')
+
+    bars = recompute_bars(engine, 'prices', first_new)
+
+    # Only the fiscal years the new days fell into: FY2024 (March) and FY2025 (April)
+    full = aggregate_ohlc(synthetic_prices(SYMBOLS, '2022-04-01', '2024-05-01'))
+    expected = full[full['period_end'] >= '2024-03-31'].reset_index(drop=True)
+    assert list(bars['Date']) == ['Mar 2024', 'Mar 2025'] * 2
+    pd.testing.assert_frame_equal(bars, expected, check_dtype=False)
+
+def test_recompute_bars_without_new_rows(engine):
+    assert recompute_bars(engine, 'prices', {}).empty
+
+def test_store_path_stops_at_end_year(engine):
+    spec = importlib.util.spec_from_file_location('comp_yfinanceapi', os.path.join(ROOT, 'comp-yfinanceapi.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    rows = module.fetch_new_ohlc_data({'Aaa': 'AAA.NS'}, engine, 'prices', start_year=2023, end_year=2024,
+                                      source='synthetic')
+
+    assert list(rows['Date']) == ['Mar 2023', 'Mar 2024']
+    assert set(rows['period_type']) == {'annual'}
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from prices import empty_panel, synthetic_prices, threaded_prices
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr('prices.time.sleep', lambda seconds: None)
+
+def counting(fetch):
+    """Wrap a source and count its calls per symbol."""
+    calls = {}
+
+    def wrapped(symbols, start, end):
+        for symbol in symbols:
+            calls[symbol] = calls.get(symbol, 0) + 1
+        return fetch(symbols, start, end)
+    return wrapped, calls
+
+def test_threaded_matches_one_batched_call():
+    symbols = ['AAA.NS', 'BBB.NS', 'CCC']
+    fetch, calls = counting(synthetic_prices)
+
+    panel = threaded_prices(fetch, max_workers=2)(symbols, '2024-01-01', '2024-02-01')
+
+    expected = synthetic_prices(symbols, '2024-01-01', '2024-02-01')
+    pd.testing.assert_frame_equal(panel.sort_values(['symbol', 'Date'], ignore_index=True), expected)
+    assert calls == {s: 1 for s in symbols}
+
+def test_weekend_range_is_not_fetched_or_failed(capsys):
+    fetch, calls = counting(synthetic_prices)
+
+    panel = threaded_prices(fetch)(['AAA.NS', 'BBB.NS'], '2024-05-18', '2024-05-20')
+
+    assert panel.empty
+    assert calls == {}
+    assert 'failed' not in capsys.readouterr().out
+
+def test_holiday_is_not_a_failure(capsys):
+    fetch, calls = counting(lambda symbols, start, end: empty_panel())
+
+    panel = threaded_prices(fetch, retries=2)(['AAA.NS'], '2024-05-20', '2024-05-21')
+
+    assert panel.empty
+    assert calls == {'AAA.NS': 3}
+    out = capsys.readouterr().out
+    assert '1 of 1 symbols have no bars' in out
+    assert 'failed after' not in out
+
+def test_errors_are_retried_then_reported(capsys):
+    attempts = {}
+
+    def flaky(symbols, start, end):
+        symbol = symbols[0]
+        attempts[symbol] = attempts.get(symbol, 0) + 1
+        if symbol == 'BAD' or attempts[symbol] == 1:
+            raise ConnectionError('reset by peer')
+        return synthetic_prices(symbols, start, end)
+
+    panel = threaded_prices(flaky, retries=3)(['GOOD', 'BAD'], '2024-01-01', '2024-01-08')
+
+    assert set(panel['symbol']) == {'GOOD'}
+    assert attempts == {'GOOD': 2, 'BAD': 4}
+    assert 'BAD: reset by peer' in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import json
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from change_detection import load_changes
+from pg_copy import bulk_load
+from schema_drift import add_missing_columns, schema_version
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    pd.DataFrame({'company_name': ['A'], 'date': ['Mar 2023'], 'sales': [1.0]}).to_sql('t', engine, index=False)
+    return engine
+
+def versions(engine):
+    with engine.connect() as conn:
+        rows = conn.execute(text('SELECT version, columns, added FROM schema_versions ORDER BY version')).all()
+    return [(version, json.loads(columns), json.loads(added)) for version, columns, added in rows]
+
+def test_versions_are_recorded(engine):
+    df = pd.DataFrame({'company_name': ['A'], 'date': ['Mar 2024'], 'sales': [2.0], 'profit': [0.5]})
+
+    assert add_missing_columns(engine, df, 't') == ['profit']
+    assert add_missing_columns(engine, df, 't') == []
+    assert add_missing_columns(engine, df.assign(tax=1.0, notes='x'), 't') == ['tax', 'notes']
+
+    # The schema before the first change is version 1
+    assert versions(engine) == [
+        (1, ['company_name', 'date', 'sales'], []),
+        (2, ['company_name', 'date', 'sales', 'profit'], ['profit']),
+        (3, ['company_name', 'date', 'sales', 'profit', 'tax', 'notes'], ['tax', 'notes']),
+    ]
+    with engine.connect() as conn:
+        assert schema_version(conn, 't')[0] == 3
+        assert schema_version(conn, 'other') == (0, None)
+
+def test_missing_table_is_left_to_the_loader(engine):
+    assert add_missing_columns(engine, pd.DataFrame({'a': [1]}), 'missing') == []
+
+def test_append_picks_up_new_columns(engine):
+    bulk_load(pd.DataFrame({'company_name': ['B'], 'date': ['Mar 2023'], 'sales': [3.0], 'profit': [0.3]}),
+              engine, 't', if_exists='append')
+
+    stored = pd.read_sql('SELECT * FROM t ORDER BY company_name', engine)
+    assert list(stored.columns) == ['company_name', 'date', 'sales', 'profit']
+    assert stored['profit'].isna().tolist() == [True, False]
+
+def test_delta_load_picks_up_new_columns(capsys):
+    engine = create_engine('sqlite://')
+    old = pd.DataFrame({'company_name': ['A', 'A'], 'date': ['Mar 2023', 'Mar 2024'], 'sales': [1.0, 2.0]})
+    load_changes(old, engine, 't')
+    capsys.readouterr()
+
+    new = old.assign(profit=[0.1, 0.2])
+    assert load_changes(new, engine, 't') == (0, 2, 0)
+
+    assert 'Full load' not in capsys.readouterr().out
+    stored = pd.read_sql('SELECT * FROM t ORDER BY date', engine)
+    assert stored['profit'].tolist() == [0.1, 0.2]
+    assert versions(engine)[-1][2] == ['profit']
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fake_screener import synthetic_page
+from screener import STATEMENT_SECTIONS, parse_sections, to_numeric_block
+
+def test_to_numeric_block_matches_pd_to_numeric():
+    values = np.array([
+        ['1,234', '12%', '3.5', '', '-7'],
+        ['-56', '1,000%', '-0.25', '42', '0'],
+        ['789', '7', 'abc', '1', '12,345,678'],
+    ], dtype=object)
+
+    numbers, integral = to_numeric_block(values)
+
+    for i in range(values.shape[1]):
+        cleaned = pd.Series(values[:, i]).str.replace(',', '').str.replace('%', '')
+        expected = pd.to_numeric(cleaned, errors='coerce')
+        np.testing.assert_array_equal(numbers[:, i], expected.to_numpy(dtype=float))
+        assert integral[i] == pd.api.types.is_integer_dtype(expected)
+
+@pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+def test_parse_sections_of_a_fake_page(backend):
+    frames = parse_sections(synthetic_page('PARSE', n_rows=4, n_years=3, filler_kb=1), backend=backend)
+
+    assert list(frames) == list(STATEMENT_SECTIONS)
+    df = frames['profit-loss']
+    assert df.shape == (4, 4)
+    assert list(df.columns[1:]) == ['Mar 2013', 'Mar 2014', 'Mar 2015']
+
+def test_parser_backends_agree():
+    page = synthetic_page('SAME', n_rows=5, n_years=4, filler_kb=1)
+    for section_id, df in parse_sections(page, backend='bs4').items():
+        pd.testing.assert_frame_equal(df, parse_sections(page, backend='lxml')[section_id])
@@ -0,0 +1,30 @@
+from conftest import SERVER, run_with_timeout, stale_session
+from screener import COMPANY_URL, fetch_all_data
+from session_store import load_session, login_session
+from transport import Transport
+
+def test_relogin_through_concurrent_transport(tmp_path):
+    store_path = str(tmp_path / 'session.json')
+    session = stale_session(store_path)
+    transport = Transport(session, concurrency=4, rate=1000)
+    urls = [COMPANY_URL.format(company=f'RELOGIN{i}') for i in range(8)]
+
+    pages = run_with_timeout(lambda: fetch_all_data(transport, urls, max_workers=4))
+
+    assert all(page and b"id='profit-loss'" in page for page in pages)
+    # The fresh session was stored, and the concurrent redirects shared one login
+    stored = load_session(store_path)
+    assert stored.cookies.get('sessionid') in SERVER.state.sessions
+    assert len(SERVER.state.sessions) == 1
+
+def test_failed_relogin_returns_the_redirect(tmp_path):
+    store_path = str(tmp_path / 'session.json')
+    stale_session(store_path)
+    # The fake server rejects logins without a username
+    session = login_session('', '', store_path)
+    transport = Transport(session, concurrency=1, rate=1000)
+
+    response = run_with_timeout(lambda: transport.get(COMPANY_URL.format(company='NOLOGIN'), allow_redirects=False))
+
+    assert response.status_code == 302
+    assert '/login/' in response.headers['Location']
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.types import Float
+from screener import concat_statements, save_to_transposed_csv
+from statements import load_to_postgres
+
+def statement_frame(company, values):
+    """Transposed profit-loss frame for one company, as the scrapers build it."""
+    page_table = pd.DataFrame({'Narration': ['Sales', 'Other income'], 'Mar 2023': values[0], 'Mar 2024': values[1]})
+    frames = []
+    save_to_transposed_csv(page_table, company, frames, 'profit-loss')
+    return concat_statements(frames)
+
+@pytest.mark.parametrize('mode', ['replace', 'merge', 'delta'])
+def test_line_items_are_created_as_floats(mode):
+    engine = create_engine('sqlite://')
+
+    assert load_to_postgres(statement_frame('A', [['1,200', '3'], ['1,300', '4']]), engine, 't', mode)
+
+    columns = {c['name']: c['type'] for c in inspect(engine).get_columns('t')}
+    assert isinstance(columns['sales'], Float)
+    assert isinstance(columns['other_income'], Float)
+
+def test_decimals_after_an_integer_load_are_kept():
+    engine = create_engine('sqlite://')
+    load_to_postgres(statement_frame('A', [['1,200', '3'], ['1,300', '4']]), engine, 't', 'merge')
+
+    assert load_to_postgres(statement_frame('B', [['0.52', '1.25'], ['7', '0.1']]), engine, 't', 'merge')
+
+    stored = pd.read_sql("SELECT date, sales, other_income FROM t WHERE company_name = 'B' ORDER BY date", engine)
+    assert stored['sales'].tolist() == [0.52, 7.0]
+    assert stored['other_income'].tolist() == [1.25, 0.1]
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.types import Float
+from session_store import login_session
+from statements import load_to_postgres
+from streaming import iter_batches, stream_statements
+
+@pytest.mark.parametrize('mode', ['replace', 'merge', 'delta'])
+def test_decimal_batch_after_an_integer_batch(pages, mode):
+    pages('WHOLE', ['1,200', '1,300'])
+    pages('DECIMAL', ['0.52', '7.25'])
+    engine = create_engine('sqlite://')
+    load = lambda df, table_name, table_mode: load_to_postgres(df, engine, table_name, table_mode)
+
+    loaded = stream_statements(login_session('user', 'secret'), ['WHOLE', 'DECIMAL'], {'profit-loss': 't'}, load,
+                               batch_size=1, max_workers=1, mode=mode)
+
+    assert loaded
+    assert isinstance({c['name']: c['type'] for c in inspect(engine).get_columns('t')}['sales'], Float)
+    stored = pd.read_sql('SELECT company_name, sales FROM t ORDER BY company_name, period_end', engine)
+    assert stored.values.tolist() == [['DECIMAL', 0.52], ['DECIMAL', 7.25], ['WHOLE', 1200.0], ['WHOLE', 1300.0]]
+
+def test_iter_batches():
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_batches([], 2)) == []
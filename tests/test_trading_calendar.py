@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from prices import synthetic_prices
+from trading_calendar import TradingCalendar, calendars_from_prices, exchange_of, prices_on_or_after
+
+# 2024-01-08 (a Monday) is missing from the stored sessions; 2024-01-15 is a published holiday
+SESSIONS = pd.bdate_range('2024-01-02', '2024-01-12').drop(pd.Timestamp('2024-01-08'))
+HOLIDAYS = {'NSE': [pd.Timestamp('2024-01-15')]}
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar('NSE', SESSIONS, HOLIDAYS['NSE'])
+
+def test_exchange_of():
+    assert exchange_of('ITC.NS') == 'NSE'
+    assert exchange_of('ITC.BO') == 'BSE'
+    assert exchange_of('AAPL') == 'US'
+
+@pytest.mark.parametrize('date, session', [
+    ('2024-01-03', '2024-01-03'),  # a session
+    ('2024-01-06', '2024-01-09'),  # weekend, then the stored holiday
+    ('2024-01-08', '2024-01-09'),  # stored holiday
+    ('2024-01-02', '2024-01-02'),  # first session
+    ('2023-12-30', '2024-01-01'),  # before the first session: weekends only
+    ('2024-01-12', '2024-01-12'),  # last session
+    ('2024-01-13', '2024-01-16'),  # after the last session: weekend, then the extra holiday
+])
+def test_next_session(calendar, date, session):
+    assert calendar.next_session(date) == pd.Timestamp(session)
+
+def test_next_sessions_is_vectorized(calendar):
+    dates = ['2024-01-13', '2024-01-08', '2023-12-30']
+    assert list(calendar.next_sessions(dates)) == [calendar.next_session(d) for d in dates]
+
+def test_is_session_and_holidays(calendar):
+    assert calendar.is_session('2024-01-09')
+    assert not calendar.is_session('2024-01-08')
+    assert not calendar.is_session('2024-01-06')
+    assert not calendar.is_session('2024-01-15')
+    assert calendar.is_session('2024-01-16')
+    assert list(calendar.holidays) == [pd.Timestamp('2024-01-08'), pd.Timestamp('2024-01-15')]
+
+def test_empty_calendar_uses_weekdays_and_extra_holidays():
+    calendar = TradingCalendar('NSE', [], HOLIDAYS['NSE'])
+    assert calendar.next_session('2024-01-13') == pd.Timestamp('2024-01-16')
+
+def test_prices_on_or_after():
+    nse = synthetic_prices(['AAA.NS', 'BBB.NS'], '2024-01-02', '2024-01-13')
+    nse = nse[nse['Date'] != '2024-01-08']
+    us = synthetic_prices(['CCC'], '2024-01-02', '2024-01-17')
+    panel = pd.concat([nse, us], ignore_index=True)
+    calendars = calendars_from_prices(panel, HOLIDAYS)
+
+    result = prices_on_or_after(panel, ['2024-01-08', '2024-01-13'], calendars)
+
+    assert result[['symbol', 'AsOf', 'Date']].astype(str).values.tolist() == [
+        ['AAA.NS', '2024-01-08', '2024-01-09'],
+        ['BBB.NS', '2024-01-08', '2024-01-09'],
+        # US sessions come from CCC's own bars, without the NSE holidays
+        ['CCC', '2024-01-08', '2024-01-08'],
+        ['CCC', '2024-01-13', '2024-01-15'],
+    ]
+    # After the stored range NSE's next session is 2024-01-16, which has no bars yet
+    assert calendars['NSE'].next_session('2024-01-13') == pd.Timestamp('2024-01-16')
+    assert list(result.columns) == list(panel.columns) + ['AsOf']
+
+def test_prices_on_or_after_without_bars():
+    assert prices_on_or_after(synthetic_prices([], '2024-01-02', '2024-01-10'), ['2024-01-03'], {}).empty
@@ -0,0 +1,78 @@
+import pytest
+import requests
+from conftest import run_with_timeout, stale_session
+from screener import COMPANY_URL, DASH_URL
+from transport import TokenBucket, Transport
+
+def test_hook_can_send_while_its_response_is_unread():
+    session = requests.Session()
+    transport = Transport(session, concurrency=1, rate=1000)
+    seen = []
+
+    def nested(response, *args, **kwargs):
+        # Like the re-login hook: a second request before this response is read
+        if not seen:
+            seen.append(None)
+            seen[0] = session.get(DASH_URL, allow_redirects=False).status_code
+        return response
+
+    session.hooks['response'].append(nested)
+    response = run_with_timeout(lambda: transport.get(DASH_URL, allow_redirects=False))
+    assert response.status_code == 302
+    assert seen == [302]
+
+def test_relogin_through_serial_transport(tmp_path):
+    store_path = str(tmp_path / 'session.json')
+    session = stale_session(store_path)
+    transport = Transport(session, concurrency=1, rate=1000)
+
+    response = run_with_timeout(lambda: transport.get(COMPANY_URL.format(company='SERIAL')))
+
+    assert response.status_code == 200
+    assert b"id='balance-sheet'" in response.content
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('transport.time.monotonic', clock.monotonic)
+    monkeypatch.setattr('transport.time.sleep', clock.sleep)
+    return clock
+
+def test_token_bucket_spends_the_burst_then_paces(clock):
+    bucket = TokenBucket(2, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.now == 0
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(0.5)
+
+def test_token_bucket_backs_off_and_recovers(clock):
+    bucket = TokenBucket(8, min_rate=0.2, increase=1)
+    bucket.on_throttle()
+    assert bucket.rate == 4
+    for _ in range(10):
+        bucket.on_throttle()
+    assert bucket.rate == 0.2
+
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == 8
+
+def test_token_bucket_waits_out_retry_after(clock):
+    bucket = TokenBucket(100)
+    bucket.on_throttle(retry_after=5)
+
+    bucket.acquire()
+
+    assert clock.now >= 5
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+from universe import select_shard, shard_of
+
+UNIVERSE = pd.DataFrame({'symbol': [f'SYM{i}' for i in range(200)]})
+
+def test_shards_partition_the_universe():
+    shards = [select_shard(UNIVERSE, i, 4) for i in range(4)]
+
+    symbols = [s for shard in shards for s in shard['symbol']]
+    assert sorted(symbols) == sorted(UNIVERSE['symbol'])
+    assert all(len(shard) for shard in shards)
+
+def test_shards_are_stable_when_the_universe_changes():
+    grown = pd.concat([UNIVERSE, pd.DataFrame({'symbol': ['NEW1', 'NEW2']})], ignore_index=True)
+
+    before = set(select_shard(UNIVERSE, 1, 4)['symbol'])
+    after = set(select_shard(grown, 1, 4)['symbol'])
+
+    assert after - before == {s for s in ('NEW1', 'NEW2') if shard_of(s, 4) == 1}
+
+def test_single_shard_is_everything():
+    assert select_shard(UNIVERSE) is UNIVERSE
+
+@pytest.mark.parametrize('index, count', [(4, 4), (-1, 4), (0, 0)])
+def test_shard_index_out_of_range(index, count):
+    with pytest.raises(ValueError):
+        select_shard(UNIVERSE, index, count)
@@ -0,0 +1,139 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+from db import get_engine
+from price_store import get_price_table
+
+# yfinance symbol suffix -> exchange; symbols without a suffix are US listings
+EXCHANGE_SUFFIXES = {'NS': 'NSE', 'BO': 'BSE'}
+DEFAULT_EXCHANGE = 'US'
+
+def exchange_of(symbol):
+    """Exchange of a yfinance symbol, e.g. NSE for ITC.NS."""
+    if '.' not in symbol:
+        return DEFAULT_EXCHANGE
+    suffix = symbol.rsplit('.', 1)[1].upper()
+    return EXCHANGE_SUFFIXES.get(suffix, suffix)
+
+class TradingCalendar:
+    """Sorted trading sessions of one exchange, answering nearest-session lookups by binary search.
+
+    sessions are the days daily bars exist for. Weekdays between the first
+    and last session without bars are the exchange's holidays; outside that
+    range, days are sessions unless they fall on a weekend or on one of the
+    extra holidays (e.g. a published holiday list for the coming year).
+    """
+
+    def __init__(self, exchange, sessions, holidays=()):
+        self.exchange = exchange
+        self.sessions = np.unique(pd.DatetimeIndex(sessions).normalize().to_numpy(dtype='datetime64[D]'))
+        self.extra_holidays = np.unique(pd.DatetimeIndex(list(holidays)).to_numpy(dtype='datetime64[D]'))
+
+    def __len__(self):
+        return len(self.sessions)
+
+    @property
+    def holidays(self):
+        """Weekdays within the stored range that had no session, plus the extra holidays."""
+        if not len(self.sessions):
+            return pd.DatetimeIndex(self.extra_holidays)
+        weekdays = pd.bdate_range(self.sessions[0], self.sessions[-1]).to_numpy(dtype='datetime64[D]')
+        missing = np.setdiff1d(weekdays, self.sessions)
+        return pd.DatetimeIndex(np.union1d(missing, self.extra_holidays))
+
+    def is_session(self, date):
+        """Whether the exchange trades on date."""
+        day = np.datetime64(pd.Timestamp(date).date(), 'D')
+        if len(self.sessions) and self.sessions[0] <= day <= self.sessions[-1]:
+            i = np.searchsorted(self.sessions, day)
+            return i < len(self.sessions) and self.sessions[i] == day
+        return bool(np.is_busday(day, holidays=self.extra_holidays))
+
+    def next_sessions(self, dates):
+        """Nearest session on or after each date, as a DatetimeIndex (vectorized searchsorted)."""
+        days = pd.DatetimeIndex(dates).normalize().to_numpy(dtype='datetime64[D]')
+        positions = np.searchsorted(self.sessions, days, side='left')
+        inside = (positions > 0) & (positions < len(self.sessions))
+        if len(self.sessions):
+            inside |= days == self.sessions[0]
+        result = np.empty(len(days), dtype='datetime64[D]')
+        result[inside] = self.sessions[positions[inside]]
+        # Outside the stored range, roll forward over weekends and known holidays
+        result[~inside] = np.busday_offset(days[~inside], 0, roll='forward', holidays=self.extra_holidays)
+        return pd.DatetimeIndex(result.astype('datetime64[ns]'))
+
+    def next_session(self, date):
+        """Nearest session on or after date."""
+        return self.next_sessions([date])[0]
+
+def read_holidays(path=None):
+    """Extra holidays from HOLIDAY_FILE, a CSV with exchange and date columns, as {exchange: [dates]}."""
+    path = path or os.getenv('HOLIDAY_FILE')
+    if not path:
+        return {}
+    df = pd.read_csv(path, parse_dates=['date'])
+    return {exchange: list(group['date']) for exchange, group in df.groupby('exchange')}
+
+def calendars_from_prices(panel, holidays=None):
+    """Build {exchange: TradingCalendar} from a daily price panel (symbol, Date, ...)."""
+    holidays = holidays if holidays is not None else read_holidays()
+    exchanges = panel['symbol'].map(exchange_of)
+    calendars = {
+        exchange: TradingCalendar(exchange, dates.unique(), holidays.get(exchange, ()))
+        for exchange, dates in panel['Date'].groupby(exchanges.to_numpy())
+    }
+    for exchange, days in holidays.items():
+        calendars.setdefault(exchange, TradingCalendar(exchange, [], days))
+    return calendars
+
+def load_calendars(engine, table_name=None, holidays=None):
+    """Build the calendars from the sessions in the daily price store (see price_store)."""
+    table_name = table_name or get_price_table('daily_prices')
+    if not inspect(engine).has_table(table_name):
+        return calendars_from_prices(pd.DataFrame({'symbol': [], 'Date': pd.DatetimeIndex([])}), holidays)
+    # One row per symbol suffix (".NS") and day instead of every stored bar; exchange_of reads the suffix alone
+    query = text(
+        f"SELECT DISTINCT COALESCE(substring(symbol from '[.][^.]+$'), '') AS symbol, \"Date\" FROM \"{table_name}\""
+    )
+    with engine.connect() as conn:
+        sessions = pd.read_sql_query(query, conn, parse_dates=['Date'])
+    return calendars_from_prices(sessions, holidays)
+
+def prices_on_or_after(panel, dates, calendars):
+    """Each symbol's bar on the nearest session on or after each date, from an already loaded panel.
+
+    Returns one row per (symbol, date) with the requested date as 'AsOf'.
+    Symbols without a bar on that session (suspended, not yet listed) are
+    left out. No requests are made.
+    """
+    requested = pd.DatetimeIndex(dates)
+    frames = []
+    for exchange, bars in panel.groupby(panel['symbol'].map(exchange_of)):
+        sessions = calendars[exchange].next_sessions(requested)
+        wanted = pd.DataFrame({'AsOf': requested, 'Date': sessions})
+        frames.append(bars.merge(wanted, on='Date'))
+    if not frames:
+        return panel.iloc[0:0].assign(AsOf=pd.DatetimeIndex([]))
+    return pd.concat(frames, ignore_index=True).sort_values(['symbol', 'AsOf'], ignore_index=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the nearest trading session on or after each date.")
+    parser.add_argument('--table', default=get_price_table('daily_prices'))
+    parser.add_argument('--exchange', default='NSE')
+    parser.add_argument('dates', nargs='+')
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if not engine:
+        return
+    calendar = load_calendars(engine, args.table).get(args.exchange)
+    if calendar is None:
+        print(f"No sessions stored for {args.exchange}.")
+        return
+    for date, session in zip(args.dates, calendar.next_sessions(args.dates)):
+        print(f"{date}: {session.date()}")
+
+if __name__ == "__main__":
+    main()
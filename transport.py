@@ -0,0 +1,130 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate adapts to server pushback.
+
+    The rate starts at max_rate, is halved on every 429/5xx (never below
+    min_rate) and grows back by `increase` per successful request. A
+    Retry-After pauses all callers until it has passed.
+    """
+
+    def __init__(self, max_rate, burst=None, min_rate=0.2, increase=0.1):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.increase = increase
+        self.capacity = burst or max(1.0, max_rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+def parse_retry_after(value):
+    """Return the Retry-After header (seconds or HTTP date) as seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class Transport:
+    """Rate-limited, retrying wrapper around a requests.Session.
+
+    Exposes get() like a session, so it can be passed wherever the scraper
+    helpers expect one. Connection errors, timeouts and 429/5xx responses are
+    retried with backoff; the last response (or error) is returned once
+    retries run out.
+    """
+
+    def __init__(self, session, concurrency=4, rate=None, retries=None, timeout=None):
+        self.session = session
+        self.limiter = TokenBucket(rate or float(os.getenv('SCRAPE_RATE', '2')))
+        self.retries = retries if retries is not None else int(os.getenv('SCRAPE_RETRIES', '5'))
+        self.timeout = timeout or float(os.getenv('SCRAPE_TIMEOUT', '30'))
+
+        # Keep one connection per worker thread alive. The pool does not block when
+        # it is empty: a response hook (re-login) may send while its own response
+        # still holds a connection, and would otherwise wait for itself.
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    @property
+    def cookies(self):
+        return self.session.cookies
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    raise
+                delay = backoff_delay(attempt)
+                print(f"Request to {url} failed ({e}), retrying in {delay:.1f}s.")
+                self.limiter.on_throttle()
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                self.limiter.on_success()
+                return response
+            if attempt == self.retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.limiter.on_throttle(retry_after)
+            delay = max(retry_after or 0, backoff_delay(attempt))
+            print(f"{url} returned {response.status_code}, retrying in {delay:.1f}s.")
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
@@ -0,0 +1,72 @@
+import argparse
+import os
+import zlib
+import pandas as pd
+
+DEFAULT_UNIVERSE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'universe.csv')
+
+# Column names of NSE's EQUITY_L.csv download, mapped to ours
+NSE_COLUMNS = {'name of company': 'name'}
+
+def load_universe(path=None, table=None, engine=None):
+    """Load the company universe as a DataFrame with symbol, name, sector and yf_symbol.
+
+    Reads the Postgres table `table` when given (needs engine), otherwise the
+    CSV at path (default universe.csv). NSE's EQUITY_L.csv can be used as is;
+    missing sector defaults to empty and yf_symbol to <symbol>.NS.
+    """
+    if table:
+        df = pd.read_sql_table(table, con=engine)
+    else:
+        df = pd.read_csv(path or DEFAULT_UNIVERSE, dtype=str, skipinitialspace=True)
+
+    df.columns = [c.strip().lower() for c in df.columns]
+    df = df.rename(columns=NSE_COLUMNS)
+    df['symbol'] = df['symbol'].str.strip()
+    for column in ['name', 'sector']:
+        if column not in df.columns:
+            df[column] = ''
+    if 'yf_symbol' not in df.columns:
+        df['yf_symbol'] = df['symbol'] + '.NS'
+    df['yf_symbol'] = df['yf_symbol'].fillna(df['symbol'] + '.NS')
+    return df[['symbol', 'name', 'sector', 'yf_symbol']].drop_duplicates('symbol').reset_index(drop=True)
+
+def shard_of(symbol, shard_count):
+    """Stable shard number of a symbol, unaffected by other symbols joining or leaving."""
+    return zlib.crc32(symbol.encode('utf-8')) % shard_count
+
+def select_shard(universe, shard_index=0, shard_count=1):
+    """Return the rows of universe owned by shard_index out of shard_count."""
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard index {shard_index} is outside 0..{shard_count - 1}")
+    if shard_count == 1:
+        return universe
+    mask = universe['symbol'].map(lambda s: shard_of(s, shard_count) == shard_index)
+    return universe[mask].reset_index(drop=True)
+
+def add_universe_arguments(parser):
+    """Add --universe/--universe-table/--sector/--shard-index/--shard-count to an ArgumentParser.
+
+    Defaults come from UNIVERSE_FILE, UNIVERSE_TABLE, SECTOR, SHARD_INDEX and
+    SHARD_COUNT so pipeline tasks can configure shards through params.
+    """
+    parser.add_argument('--universe', default=os.getenv('UNIVERSE_FILE'), help='universe CSV file')
+    parser.add_argument('--universe-table', default=os.getenv('UNIVERSE_TABLE'), help='Postgres table holding the universe')
+    parser.add_argument('--sector', default=os.getenv('SECTOR'), help='only companies in this sector')
+    parser.add_argument('--shard-index', type=int, default=int(os.getenv('SHARD_INDEX', '0')))
+    parser.add_argument('--shard-count', type=int, default=int(os.getenv('SHARD_COUNT', '1')))
+    return parser
+
+def parse_universe_args(description=None):
+    """Parse the universe command line options of an entry point."""
+    return add_universe_arguments(argparse.ArgumentParser(description=description)).parse_args()
+
+def companies_for(args, engine_factory=None):
+    """Return this shard's slice of the universe selected by parsed args."""
+    engine = engine_factory() if args.universe_table and engine_factory else None
+    universe = load_universe(args.universe, args.universe_table, engine)
+    if args.sector:
+        universe = universe[universe['sector'].str.lower() == args.sector.lower()]
+    companies = select_shard(universe, args.shard_index, args.shard_count)
+    print(f"Shard {args.shard_index + 1}/{args.shard_count}: {len(companies)} of {len(universe)} companies.")
+    return companies